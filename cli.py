@@ -4,31 +4,106 @@ Meeting Assistant CLI
 Command-line interface for the meeting assistant
 """
 
+import asyncio
+import contextlib
 import click
-import time
 from rich.console import Console
-from rich.table import Table
-from rich.live import Live
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from pathlib import Path
 
-from src.meeting import MeetingAssistant
-from src.config import config
+# Heavy imports (src.meeting pulls in torch/whisper/transformers, and the
+# rich renderers) are deferred to the commands that need them so that
+# `--help` and metadata commands start quickly.
 
 console = Console()
 
+# Record loop: poll status often enough to catch each second tick, but only
+# redraw when the displayed second changes or the transcript grows noticeably
+STATUS_POLL_INTERVAL = 0.25
+TRANSCRIPT_REDRAW_THRESHOLD = 256
+
+# Post-recording stages reported by MeetingAssistant.stop_meeting_parallel()
+FINALIZE_STAGES = {
+    'transcription': "Finalizing transcript...",
+    'summary': "Generating summary...",
+    'key_points': "Extracting key points...",
+    'action_items': "Extracting action items...",
+}
+
+# Shared by the long-running commands; see get_event_emitter()
+events_file_option = click.option(
+    '--events-file',
+    type=click.Path(dir_okay=False),
+    help='Append progress events as JSON lines to this file '
+         '(disables live progress rendering)'
+)
+
+def make_progress(enabled=True):
+    """Spinner progress display for long-running steps.
+
+    When stdout isn't a terminal (piped, redirected to a log) or enabled is
+    False the display is disabled, so Rich starts no redraw thread and writes
+    no escape codes.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        disable=not (enabled and console.is_terminal)
+    )
+
+def iter_chunks(stream, chars=8192):
+    """Return an iterator over ``chars``-sized chunks of a text stream."""
+    return iter(lambda: stream.read(chars), '')
+
 @click.group()
-def cli():
+@click.pass_context
+def cli(ctx):
     """Meeting Assistant - AI-powered meeting transcription and summarization"""
-    pass
+    ctx.ensure_object(dict)
+
+def get_assistant(ctx, engines=True):
+    """Return the MeetingAssistant shared by this CLI invocation.
+
+    The assistant is created and initialized on first use, cached on the
+    root context and cleaned up when that context closes, so commands never
+    load the engines twice. With engines=False only audio is initialized;
+    the STT and summarization engines then load when first used.
+    Returns None if initialization fails.
+    """
+    root = ctx.find_root()
+    root.ensure_object(dict)
+    if 'assistant' not in root.obj:
+        from src.meeting import MeetingAssistant
+
+        assistant = MeetingAssistant()
+        if not assistant.initialize(stt=engines, summarization=engines):
+            console.print("[red]Failed to initialize meeting assistant[/red]")
+            assistant.cleanup()
+            return None
+        root.obj['assistant'] = assistant
+        root.call_on_close(assistant.cleanup)
+    return root.obj['assistant']
+
+def get_event_emitter(ctx, events_file):
+    """Return a JSON-lines event emitter closed with the CLI context.
+
+    Without an events file the emitter is disabled and ignores events.
+    """
+    from src.utils.events import JSONLEventEmitter
+
+    emitter = JSONLEventEmitter(events_file)
+    ctx.call_on_close(emitter.close)
+    return emitter
 
 @cli.command()
-def devices():
+@click.pass_context
+def devices(ctx):
     """List available audio input devices"""
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    from rich.table import Table
+
+    assistant = get_assistant(ctx, engines=False)
+    if assistant is None:
         return
 
     devices = assistant.audio_recorder.list_input_devices()
@@ -46,14 +121,15 @@ def devices():
         )
 
     console.print(table)
-    assistant.cleanup()
 
 @cli.command()
-def status():
+@click.pass_context
+def status(ctx):
     """Show current engine status"""
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    from rich.panel import Panel
+
+    assistant = get_assistant(ctx)
+    if assistant is None:
         return
 
     status_info = assistant.get_engine_status()
@@ -78,16 +154,14 @@ def status():
         border_style="green"
     ))
 
-    assistant.cleanup()
-
 @cli.command()
 @click.option('--stt-engine', default=None, help='STT engine to use (whisper, vosk)')
 @click.option('--sum-engine', default=None, help='Summarization engine to use (qwen3, ollama)')
-def engines(stt_engine, sum_engine):
+@click.pass_context
+def engines(ctx, stt_engine, sum_engine):
     """List available engines or switch engines"""
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    assistant = get_assistant(ctx)
+    if assistant is None:
         return
 
     if stt_engine:
@@ -112,19 +186,25 @@ def engines(stt_engine, sum_engine):
         for engine in assistant.get_available_summarization_engines():
             console.print(f"  • {engine}")
 
-    assistant.cleanup()
-
 @cli.command()
 @click.option('--title', '-t', help='Meeting title')
 @click.option('--participants', '-p', help='Comma-separated list of participants')
 @click.option('--device', '-d', type=int, help='Audio input device index')
-def record(title, participants, device):
+@events_file_option
+@click.pass_context
+def record(ctx, title, participants, device, events_file):
     """Start a new meeting recording"""
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+    from src.config import config
+
+    assistant = get_assistant(ctx)
+    if assistant is None:
         return
 
+    events = get_event_emitter(ctx, events_file)
+
     # Set audio device if specified
     if device is not None:
         config.audio.input_device = device
@@ -139,50 +219,123 @@ def record(title, participants, device):
     result = assistant.start_meeting(title, participant_list)
 
     if not result['success']:
+        events.emit('meeting_failed', error=result.get('error', 'Unknown error'))
         console.print(f"[red]Failed to start meeting: {result.get('error', 'Unknown error')}[/red]")
-        assistant.cleanup()
         return
 
+    events.emit(
+        'meeting_started',
+        meeting_id=result['meeting_id'],
+        title=result['title']
+    )
     console.print(f"[green]Meeting started: {result['title']}[/green]")
     console.print("[yellow]Press Ctrl+C to stop recording[/yellow]")
 
+    # Participants don't change during recording - join them once
+    participants_str = ', '.join(participant_list) if participant_list else 'None'
+
+    async def watch_meeting():
+        # Redraw when the displayed second ticks over or the transcript grows;
+        # new transcript text is pushed in from the audio thread, so there's
+        # no need to wait out a full poll interval to show it
+        loop = asyncio.get_running_loop()
+        transcript_updated = asyncio.Event()
+
+        def on_transcript(_text):
+            try:
+                loop.call_soon_threadsafe(transcript_updated.set)
+            except RuntimeError:
+                pass  # Event loop already closed
+
+        # The panel is built once and its contents swapped in place
+        panel = Panel(
+            "",
+            title="[bold green]Recording in Progress[/bold green]",
+            border_style="green"
+        )
+        last_duration = None
+        last_transcript_len = None
+
+        # With an events file, status goes there instead of a live panel
+        live = (
+            None if events.enabled
+            else Live(panel, console=console, auto_refresh=False)
+        )
+
+        assistant.add_transcript_listener(on_transcript)
+        try:
+            with live or contextlib.nullcontext():
+                while True:
+                    status = assistant.get_current_meeting_status()
+                    if not status['active']:
+                        break
+
+                    duration = status['duration']
+                    transcript_len = status['transcript_length']
+                    if (duration != last_duration or
+                            transcript_len - last_transcript_len >= TRANSCRIPT_REDRAW_THRESHOLD):
+                        last_duration = duration
+                        last_transcript_len = transcript_len
+
+                        events.emit(
+                            'status',
+                            duration=duration,
+                            transcript_length=transcript_len
+                        )
+
+                        if live:
+                            minutes, seconds = divmod(duration, 60)
+
+                            panel.renderable = Text(
+                                f"Meeting: {status['title']}\n"
+                                f"Duration: {minutes:02d}:{seconds:02d}\n"
+                                f"Transcript Length: {transcript_len} characters\n"
+                                f"Participants: {participants_str}"
+                            )
+                            live.refresh()
+
+                    try:
+                        await asyncio.wait_for(
+                            transcript_updated.wait(), STATUS_POLL_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    transcript_updated.clear()
+        finally:
+            assistant.remove_transcript_listener(on_transcript)
+
     try:
-        # Live status display
-        with Live(console=console, refresh_per_second=1) as live:
-            while True:
-                status = assistant.get_current_meeting_status()
-                if not status['active']:
-                    break
-
-                duration = status['duration']
-                minutes = duration // 60
-                seconds = duration % 60
-
-                panel = Panel(
-                    f"Meeting: {status['title']}\n"
-                    f"Duration: {minutes:02d}:{seconds:02d}\n"
-                    f"Transcript Length: {status['transcript_length']} characters\n"
-                    f"Participants: {', '.join(status['participants']) if status['participants'] else 'None'}",
-                    title="[bold green]Recording in Progress[/bold green]",
-                    border_style="green"
-                )
-                live.update(panel)
-                time.sleep(1)
+        asyncio.run(watch_meeting())
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Stopping recording...[/yellow]")
 
-    # Stop meeting
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        task = progress.add_task("Processing meeting...", total=None)
+    events.emit('recording_stopped')
 
-        result = assistant.stop_meeting()
+    # Stop meeting
+    if not console.is_terminal:
+        console.print("Processing meeting...")
+    with make_progress(enabled=not events.enabled) as progress:
+        stage_tasks = {
+            stage: progress.add_task(description, total=1)
+            for stage, description in FINALIZE_STAGES.items()
+        }
+
+        def on_stage_complete(stage):
+            progress.update(stage_tasks[stage], completed=1)
+            events.emit('stage_completed', stage=stage)
+
+        result = assistant.stop_meeting_parallel(
+            on_stage_complete=on_stage_complete
+        )
 
         if result['success']:
+            events.emit(
+                'meeting_saved',
+                meeting_id=result['meeting_id'],
+                audio_file=result.get('audio_file'),
+                meeting_file=result.get('meeting_file')
+            )
             console.print(f"\n[green]Meeting saved successfully![/green]")
             console.print(f"Meeting ID: {result['meeting_id']}")
             console.print(f"Audio file: {result.get('audio_file', 'N/A')}")
@@ -206,89 +359,123 @@ def record(title, participants, device):
                     for item in summary['action_items']:
                         console.print(f"  • {item}")
         else:
+            events.emit('meeting_failed', error=result.get('error', 'Unknown error'))
             console.print(f"[red]Failed to save meeting: {result.get('error', 'Unknown error')}[/red]")
 
-    assistant.cleanup()
-
 @cli.command()
 @click.argument('audio_file', type=click.Path(exists=True))
 @click.option('--engine', help='STT engine to use')
-def transcribe(audio_file, engine):
+@click.option('--workers', '-w', default=1, show_default=True,
+              help='Transcribe long WAV files in parallel chunks with N workers')
+@click.option('--chunk-sec', default=180, show_default=True,
+              help='Chunk length in seconds when --workers > 1')
+@events_file_option
+@click.pass_context
+def transcribe(ctx, audio_file, engine, workers, chunk_sec, events_file):
     """Transcribe an audio file"""
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    from rich.panel import Panel
+
+    assistant = get_assistant(ctx)
+    if assistant is None:
         return
 
     if engine and not assistant.switch_stt_engine(engine):
         console.print(f"[red]Failed to switch to engine: {engine}[/red]")
-        assistant.cleanup()
         return
 
+    events = get_event_emitter(ctx, events_file)
+
     console.print(f"[yellow]Transcribing: {audio_file}[/yellow]")
+    events.emit('transcription_started', file=audio_file)
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with make_progress(enabled=not events.enabled) as progress:
         task = progress.add_task("Transcribing audio...", total=None)
 
-        result = assistant.transcribe_audio_file(audio_file)
+        def on_chunk_complete(completed, total):
+            progress.update(
+                task,
+                description=f"Transcribing audio... ({completed}/{total} chunks)"
+            )
+            events.emit('chunk_completed', completed=completed, total=total)
+
+        result = assistant.transcribe_audio_file_chunked(
+            audio_file,
+            workers=workers,
+            chunk_sec=chunk_sec,
+            on_chunk_complete=on_chunk_complete
+        )
 
         if result.get('text'):
+            events.emit(
+                'transcription_completed',
+                text_length=len(result['text']),
+                language=result.get('language')
+            )
             console.print(Panel(
                 result['text'],
                 title="Transcription",
                 border_style="green"
             ))
 
+            # Transcript is incomplete if some chunks failed
+            if result.get('failed_chunks'):
+                events.emit(
+                    'chunks_failed',
+                    failed_chunks=result['failed_chunks'],
+                    error=result['error']
+                )
+                console.print(f"[yellow]Warning: {result['error']}[/yellow]")
+
             # Show additional info
             if 'confidence' in result:
                 console.print(f"Confidence: {result['confidence']:.2f}")
             if 'language' in result:
                 console.print(f"Language: {result['language']}")
         else:
+            events.emit('transcription_failed', error=result.get('error', 'Unknown error'))
             console.print(f"[red]Transcription failed: {result.get('error', 'Unknown error')}[/red]")
 
-    assistant.cleanup()
-
 @cli.command()
 @click.argument('text_file', type=click.Path(exists=True))
 @click.option('--engine', help='Summarization engine to use')
-def summarize(text_file, engine):
+@events_file_option
+@click.pass_context
+def summarize(ctx, text_file, engine, events_file):
     """Summarize text from a file"""
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    from rich.panel import Panel
+
+    assistant = get_assistant(ctx)
+    if assistant is None:
         return
 
     if engine and not assistant.switch_summarization_engine(engine):
         console.print(f"[red]Failed to switch to engine: {engine}[/red]")
-        assistant.cleanup()
         return
 
-    # Read text file
+    # Open text file - it is streamed in chunks rather than read whole
     try:
-        with open(text_file, 'r', encoding='utf-8') as f:
-            text = f.read()
+        text_stream = open(text_file, 'r', encoding='utf-8', errors='replace')
     except Exception as e:
         console.print(f"[red]Failed to read file: {e}[/red]")
-        assistant.cleanup()
         return
 
+    events = get_event_emitter(ctx, events_file)
+
     console.print(f"[yellow]Summarizing: {text_file}[/yellow]")
+    events.emit('summarization_started', file=text_file)
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with text_stream, make_progress(enabled=not events.enabled) as progress:
         task = progress.add_task("Generating summary...", total=None)
 
-        result = assistant.summarize_text(text)
+        result = assistant.summarize_text_stream(iter_chunks(text_stream))
 
         if result.get('success'):
+            events.emit(
+                'summarization_completed',
+                summary_length=len(result.get('summary', '')),
+                key_points=len(result.get('key_points', [])),
+                action_items=len(result.get('action_items', []))
+            )
             console.print(Panel(
                 result.get('summary', 'No summary available'),
                 title="Summary",
@@ -305,28 +492,32 @@ def summarize(text_file, engine):
                 for item in result['action_items']:
                     console.print(f"  • {item}")
         else:
+            events.emit('summarization_failed', error=result.get('error', 'Unknown error'))
             console.print(f"[red]Summarization failed: {result.get('error', 'Unknown error')}[/red]")
 
-    assistant.cleanup()
-
 @cli.command()
-def test():
+@click.pass_context
+def test(ctx):
     """Test microphone and engines"""
     console.print("[yellow]Testing Meeting Assistant...[/yellow]")
 
-    assistant = MeetingAssistant()
-    if not assistant.initialize():
-        console.print("[red]Failed to initialize meeting assistant[/red]")
+    assistant = get_assistant(ctx, engines=False)
+    if assistant is None:
         return
 
-    # Test audio devices
+    # Test audio devices (no engines needed)
     devices = assistant.audio_recorder.list_input_devices()
     console.print(f"[green]Found {len(devices)} audio input devices[/green]")
 
-    # Test engines
-    status = assistant.get_engine_status()
-    stt_status = status['stt']['initialized']
-    sum_status = status['summarization']['initialized']
+    # Test engines - load each separately so one failure doesn't hide the other
+    stt_status = (
+        assistant.initialize_stt() and
+        assistant.stt_manager.get_current_engine_info()['initialized']
+    )
+    sum_status = (
+        assistant.initialize_summarization() and
+        assistant.summarization_manager.get_current_engine_info()['initialized']
+    )
 
     console.print(f"STT Engine: [{'green' if stt_status else 'red'}]{'Ready' if stt_status else 'Failed'}[/]")
     console.print(f"Summarization Engine: [{'green' if sum_status else 'red'}]{'Ready' if sum_status else 'Failed'}[/]")
@@ -336,7 +527,5 @@ def test():
     else:
         console.print("[red]Some systems failed to initialize[/red]")
 
-    assistant.cleanup()
-
 if __name__ == '__main__':
     cli()
\ No newline at end of file
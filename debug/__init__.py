@@ -0,0 +1,51 @@
+"""
+Shared settings for the debug launchers
+"""
+
+import logging
+import os
+
+DEBUG_LOG_DIR = "debug/logs"
+
+# Working directories used in debug mode (relative to the project root)
+DEBUG_DIRS = (
+    DEBUG_LOG_DIR,
+    "debug/audio",
+    "debug/audio_chunks",
+    "debug/stt_results",
+    "debug/summaries",
+    "debug/data",
+    "debug/data/meetings",
+    "debug/profiles",
+)
+
+
+def ensure_debug_dirs(dirs=DEBUG_DIRS):
+    """Create any debug directories that don't exist yet"""
+    for dir_path in dirs:
+        if not os.path.isdir(dir_path):
+            os.makedirs(dir_path, exist_ok=True)
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that formats the timestamp at most once per second
+
+    Debug mode can emit thousands of records per second; with a
+    second-resolution datefmt they all share the same asctime string.
+    """
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._cached_time = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            # Default format includes milliseconds - nothing to reuse
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, cached_text = self._cached_time
+        if cached_second != second:
+            cached_text = super().formatTime(record, datefmt)
+            self._cached_time = (second, cached_text)
+        return cached_text
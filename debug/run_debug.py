@@ -6,56 +6,141 @@ Runs the application with verbose logging and debug features enabled
 
 import os
 import sys
+import atexit
+import queue
 import logging
+import logging.handlers
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from datetime import datetime
 
+# Show output as it is produced even when stdout is piped or redirected
+# (Python block-buffers non-tty stdout by default)
+sys.stdout.reconfigure(line_buffering=True)
+
 # Add parent directory to path
 parent_dir = Path(__file__).parent.parent.absolute()
 sys.path.insert(0, str(parent_dir))
 
 # Create debug directories
-debug_dirs = [
-    "debug/logs",
-    "debug/audio",
-    "debug/audio_chunks",
-    "debug/stt_results",
-    "debug/summaries",
-    "debug/data",
-    "debug/data/meetings",
-    "debug/profiles"
-]
-
-for dir_path in debug_dirs:
-    Path(dir_path).mkdir(parents=True, exist_ok=True)
+from debug import CachedTimeFormatter, ensure_debug_dirs
+
+ensure_debug_dirs()
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that writes through a large block buffer.
+
+    StreamHandler flushes after every record, and the stock rollover check
+    calls tell() (which also flushes), costing one write() per log line.
+    Here the file size is tracked in memory instead and emit() skips the
+    per-record flush, so routine records sit in the buffer until it fills,
+    the file rotates or the handler is flushed or closed (logging.shutdown
+    does both at exit). ERROR and above are flushed immediately so they
+    survive a crash.
+    """
+
+    buffer_size = 1 << 16
+
+    def _open(self):
+        self._bytes_written = (
+            os.path.getsize(self.baseFilename)
+            if os.path.exists(self.baseFilename) else 0
+        )
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        return 0 < self.maxBytes <= self._bytes_written
+
+    def format(self, record):
+        msg = super().format(record)
+        self._bytes_written += len(msg) + len(self.terminator)
+        return msg
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if self.stream:
+                self.stream.flush()
 
 # Configure logging
+# With reload enabled uvicorn serves the app from a spawned worker, which
+# re-runs this module as __mp_main__. The worker inherits the launcher's
+# timestamp so both processes name the same log files, and the launcher
+# hands those files over before starting uvicorn (see main()), so only one
+# process ever writes and rotates them at a time.
+log_timestamp = os.environ.setdefault(
+    "MEETING_ASSISTANT_DEBUG_LOG_TIMESTAMP",
+    datetime.now().strftime('%Y%m%d_%H%M%S')
+)
 log_format = '[%(asctime)s] %(levelname)-8s [%(name)s:%(funcName)s:%(lineno)d] %(message)s'
 date_format = '%Y-%m-%d %H:%M:%S'
+log_formatter = CachedTimeFormatter(log_format, date_format)
 
 # Console handler - show everything
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setLevel(logging.DEBUG)
-console_handler.setFormatter(logging.Formatter(log_format, date_format))
+console_handler.setFormatter(log_formatter)
 
 # File handler - debug log
-debug_log_file = f"debug/logs/debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-file_handler = logging.FileHandler(debug_log_file)
+debug_log_file = f"debug/logs/debug_{log_timestamp}.log"
+file_handler = BufferedRotatingFileHandler(
+    debug_log_file, maxBytes=50_000_000, backupCount=3, delay=True
+)
 file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(logging.Formatter(log_format, date_format))
+file_handler.setFormatter(log_formatter)
 
 # Error handler - errors only
-error_log_file = f"debug/logs/error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-error_handler = logging.FileHandler(error_log_file)
+error_log_file = f"debug/logs/error_{log_timestamp}.log"
+error_handler = BufferedRotatingFileHandler(
+    error_log_file, maxBytes=50_000_000, backupCount=3, delay=True
+)
 error_handler.setLevel(logging.ERROR)
-error_handler.setFormatter(logging.Formatter(log_format, date_format))
-
-# Configure root logger
-logging.basicConfig(
-    level=logging.DEBUG,
-    handlers=[console_handler, file_handler, error_handler]
+error_handler.setFormatter(log_formatter)
+
+# Route records through a queue so call sites don't block on disk I/O;
+# a background listener thread does the actual writes
+log_queue = queue.Queue(-1)
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.DEBUG)
+root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+log_listener = logging.handlers.QueueListener(
+    log_queue, console_handler, file_handler, error_handler, respect_handler_level=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def hand_off_file_logging():
+    """Close the log files here so the reload worker can take them over
+
+    Stops the listener (draining queued records into the files), closes
+    the file handlers and restarts the listener with the console only.
+    """
+    global log_listener
+    log_listener.stop()
+    atexit.unregister(log_listener.stop)
+    file_handler.close()
+    error_handler.close()
+    log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, respect_handler_level=True
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -81,8 +166,18 @@ def print_banner():
     print("="*65)
     logger.info("Debug mode activated - all logging enabled")
 
-def print_system_info():
-    """Print detailed system information"""
+def detect_hardware():
+    """Run hardware detection (may probe the NPU via subprocesses)"""
+    from src.utils.hardware import get_hardware_detector
+    return get_hardware_detector().get_system_info()
+
+def print_system_info(hardware_future=None):
+    """Print detailed system information
+
+    Args:
+        hardware_future: Optional future already running detect_hardware();
+            hardware is detected inline when not given
+    """
     logger.info("="*65)
     logger.info("SYSTEM INFORMATION")
     logger.info("="*65)
@@ -95,9 +190,7 @@ def print_system_info():
 
     # Check hardware detection
     try:
-        from src.utils.hardware import get_hardware_detector
-        hw = get_hardware_detector()
-        info = hw.get_system_info()
+        info = hardware_future.result() if hardware_future else detect_hardware()
 
         logger.info(f"SoC Type: {info['soc_type']}")
         logger.info(f"CPU Count: {info['cpu_info']['cpu_count']}")
@@ -120,10 +213,12 @@ def check_dependencies():
     logger.info("DEPENDENCY CHECK")
     logger.info("="*65)
 
+    # Keyed by distribution name: versions are read from package metadata
+    # so torch/transformers/whisper don't have to be imported just to check
     dependencies = {
         'numpy': 'NumPy',
         'torch': 'PyTorch',
-        'whisper': 'OpenAI Whisper',
+        'openai-whisper': 'OpenAI Whisper',
         'transformers': 'Hugging Face Transformers',
         'onnxruntime': 'ONNX Runtime',
         'pyaudio': 'PyAudio',
@@ -131,12 +226,19 @@ def check_dependencies():
         'uvicorn': 'Uvicorn'
     }
 
-    for module, name in dependencies.items():
+    def lookup(distribution):
         try:
-            mod = __import__(module)
-            version = getattr(mod, '__version__', 'unknown')
-            logger.info(f"✅ {name:30s} {version}")
-        except ImportError:
+            return version(distribution)
+        except PackageNotFoundError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as executor:
+        versions = executor.map(lookup, dependencies)
+
+    for name, installed in zip(dependencies.values(), versions):
+        if installed:
+            logger.info(f"✅ {name:30s} {installed}")
+        else:
             logger.warning(f"❌ {name:30s} NOT INSTALLED")
 
     logger.info("="*65)
@@ -150,34 +252,43 @@ def main():
         logger.info(f"Working directory: {os.getcwd()}")
         logger.info(f"Config file: debug/config_debug.yaml")
 
-        # Print system info
-        print_system_info()
+        # Hardware detection is the slow part of the diagnostics, so run it
+        # in the background while the dependency check is logged
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            hardware_future = executor.submit(detect_hardware)
 
-        # Check dependencies
-        check_dependencies()
+            # Check dependencies
+            check_dependencies()
 
-        # Import and run web app
-        logger.info("Importing web application...")
+            # Print system info
+            print_system_info(hardware_future)
 
         # Change to parent directory for imports
         os.chdir(parent_dir)
 
-        from web_app import app
+        # The app is passed as an import string: with reload enabled uvicorn
+        # imports it in the worker process, so importing it here as well
+        # would only load the models twice
         import uvicorn
 
         logger.info("Starting FastAPI server in debug mode...")
         logger.info("Access the application at: http://localhost:8001")
         logger.info("Press Ctrl+C to stop")
         logger.info("="*65)
+        hand_off_file_logging()
 
         # Run with debug configuration
+        # Install watchfiles so the reloader uses OS file events instead of
+        # polling; log output is excluded to avoid reload storms
         uvicorn.run(
-            app,
+            "web_app:app",
             host="localhost",
             port=8001,
             log_level="debug",
             reload=True,
-            reload_dirs=[str(parent_dir / "src"), str(parent_dir / "web_app.py")]
+            reload_dirs=[str(parent_dir / "src"), str(parent_dir / "web_app.py")],
+            reload_includes=["*.py"],
+            reload_excludes=["debug/logs/*"]
         )
 
     except KeyboardInterrupt:
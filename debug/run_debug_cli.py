@@ -6,55 +6,61 @@ Runs the CLI with verbose logging and debug features enabled
 
 import os
 import sys
+import atexit
+import queue
 import logging
+import logging.handlers
 import traceback
 from pathlib import Path
 from datetime import datetime
 
+# Show output as it is produced even when stdout is piped or redirected
+# (Python block-buffers non-tty stdout by default)
+sys.stdout.reconfigure(line_buffering=True)
+
 # Add parent directory to path
 parent_dir = Path(__file__).parent.parent.absolute()
 sys.path.insert(0, str(parent_dir))
 
 # Create debug directories
-debug_dirs = [
-    "debug/logs",
-    "debug/audio",
-    "debug/audio_chunks",
-    "debug/stt_results",
-    "debug/summaries",
-    "debug/data",
-    "debug/data/meetings"
-]
-
-for dir_path in debug_dirs:
-    Path(dir_path).mkdir(parents=True, exist_ok=True)
+from debug import CachedTimeFormatter, ensure_debug_dirs
+
+ensure_debug_dirs()
 
 # Configure logging
+log_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 log_format = '[%(asctime)s] %(levelname)-8s [%(name)s:%(funcName)s:%(lineno)d] %(message)s'
 date_format = '%Y-%m-%d %H:%M:%S'
+log_formatter = CachedTimeFormatter(log_format, date_format)
 
 # File handler - debug log
-debug_log_file = f"debug/logs/cli_debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+debug_log_file = f"debug/logs/cli_debug_{log_timestamp}.log"
 file_handler = logging.FileHandler(debug_log_file)
 file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(logging.Formatter(log_format, date_format))
+file_handler.setFormatter(log_formatter)
 
 # Error handler
-error_log_file = f"debug/logs/cli_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+error_log_file = f"debug/logs/cli_error_{log_timestamp}.log"
 error_handler = logging.FileHandler(error_log_file)
 error_handler.setLevel(logging.ERROR)
-error_handler.setFormatter(logging.Formatter(log_format, date_format))
+error_handler.setFormatter(log_formatter)
 
 # Console handler - INFO and above for cleaner CLI output
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
 
-# Configure root logger
-logging.basicConfig(
-    level=logging.DEBUG,
-    handlers=[console_handler, file_handler, error_handler]
+# Route records through a queue so call sites don't block on disk I/O;
+# a background listener thread does the actual writes
+log_queue = queue.Queue(-1)
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.DEBUG)
+root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+log_listener = logging.handlers.QueueListener(
+    log_queue, console_handler, file_handler, error_handler, respect_handler_level=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -5,8 +5,13 @@ Shows all log levels and error handling
 """
 
 import os
+import re
 import sys
+import atexit
+import queue
 import logging
+import logging.handlers
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
@@ -15,35 +20,49 @@ parent_dir = Path(__file__).parent.parent.absolute()
 sys.path.insert(0, str(parent_dir))
 
 # Create logs directory
-Path("debug/logs").mkdir(parents=True, exist_ok=True)
+from debug import DEBUG_LOG_DIR, CachedTimeFormatter, ensure_debug_dirs
+
+ensure_debug_dirs((DEBUG_LOG_DIR,))
 
 # Configure logging
+log_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 log_format = '[%(asctime)s] %(levelname)-8s [%(name)s:%(funcName)s:%(lineno)d] %(message)s'
 date_format = '%Y-%m-%d %H:%M:%S'
+log_formatter = CachedTimeFormatter(log_format, date_format)
 
 # Setup handlers
-debug_log = f"debug/logs/test_debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-error_log = f"debug/logs/test_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+debug_log = f"debug/logs/test_debug_{log_timestamp}.log"
+error_log = f"debug/logs/test_error_{log_timestamp}.log"
 
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setLevel(logging.DEBUG)
-console_handler.setFormatter(logging.Formatter(log_format, date_format))
+console_handler.setFormatter(log_formatter)
 
 file_handler = logging.FileHandler(debug_log)
 file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(logging.Formatter(log_format, date_format))
+file_handler.setFormatter(log_formatter)
 
 error_handler = logging.FileHandler(error_log)
 error_handler.setLevel(logging.ERROR)
-error_handler.setFormatter(logging.Formatter(log_format, date_format))
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    handlers=[console_handler, file_handler, error_handler]
+error_handler.setFormatter(log_formatter)
+
+# Route records through a queue so call sites don't block on disk I/O;
+# a background listener thread does the actual writes
+log_queue = queue.Queue(-1)
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.DEBUG)
+root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+log_listener = logging.handlers.QueueListener(
+    log_queue, console_handler, file_handler, error_handler, respect_handler_level=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+# Level name as written by log_format (first match on each line)
+LEVEL_PATTERN = re.compile(r'\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b')
+
 def test_all_log_levels():
     """Demonstrate all log levels"""
     print("\n" + "="*65)
@@ -188,14 +207,23 @@ def main():
     print(f"   cat {error_log}")
     print(f"\n📊 Log statistics:")
 
-    # Count log levels in debug log
+    # Drain the log queue so every record is on disk before counting
+    log_listener.stop()
+    log_listener.start()
+
+    # Count log levels in debug log (single streaming pass)
+    counts = Counter()
     with open(debug_log, 'r') as f:
-        content = f.read()
-        print(f"   DEBUG messages:    {content.count('DEBUG')}")
-        print(f"   INFO messages:     {content.count('INFO')}")
-        print(f"   WARNING messages:  {content.count('WARNING')}")
-        print(f"   ERROR messages:    {content.count('ERROR')}")
-        print(f"   CRITICAL messages: {content.count('CRITICAL')}")
+        for line in f:
+            match = LEVEL_PATTERN.search(line)
+            if match:
+                counts[match.group(1)] += 1
+
+    print(f"   DEBUG messages:    {counts['DEBUG']}")
+    print(f"   INFO messages:     {counts['INFO']}")
+    print(f"   WARNING messages:  {counts['WARNING']}")
+    print(f"   ERROR messages:    {counts['ERROR']}")
+    print(f"   CRITICAL messages: {counts['CRITICAL']}")
 
     print()
 
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 # Change to script directory
@@ -17,6 +16,6 @@ else:
     python_cmd = sys.executable
     print(f"Virtual environment not found, using system Python: {python_cmd}")
 
-# Run CLI with arguments
-cmd = [python_cmd, "cli.py"] + sys.argv[1:]
-subprocess.run(cmd)
+# Run CLI with arguments, replacing this launcher process
+sys.stdout.flush()
+os.execv(python_cmd, [python_cmd, "cli.py"] + sys.argv[1:])
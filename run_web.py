@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 # Change to script directory
@@ -14,5 +13,6 @@ if not venv_python.exists():
     print("Error: Virtual environment not found. Please run install_sbc.py first.")
     sys.exit(1)
 
-# Run web app
-subprocess.run([str(venv_python), "web_app.py"])
+# Run web app, replacing this launcher process
+sys.stdout.flush()
+os.execv(str(venv_python), [str(venv_python), "web_app.py"])
@@ -6,29 +6,326 @@ Converts PyTorch models to ONNX/RKNN/ENNP formats for hardware acceleration
 
 import os
 import sys
+import json
+import asyncio
 import argparse
-import subprocess
+import shutil
+import functools
+import collections
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple, Union
 import logging
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.utils.hardware import get_hardware_detector
+# Repository root, added to sys.path when hardware detection is needed
+REPO_ROOT = Path(__file__).parent.parent
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Op types quantized by dynamic quantization (see _quantize_onnx)
+DYNAMIC_QUANT_OP_TYPES = ["MatMul", "Gemm", "Attention"]
+
+# Models with more parameter bytes than this are exported with their
+# weights in an external <stem>.weights file (protobuf caps files at 2GB)
+EXTERNAL_DATA_THRESHOLD = 1 << 30
+
+# Command line tools of the ENNP SDK
+ENNP_TOOLS = ["esquant", "esaac"]
+
+# Whisper export settings per target (see ModelConverter._export_for_target)
+# - rk3588: RKNN toolkit2 supports up to opset 13 and static shapes only;
+#   it quantizes to symmetric int8 itself from the calibration set
+# - eic7700: static shapes, compiled from a BF16 copy of the encoder,
+#   which the NPU runs natively without calibration; the FP32 graph (int8
+#   via EsQuant) is kept as the fallback
+# - cpu: dynamic shapes, fused attention and static QInt8 quantization for
+#   the onnxruntime int8 dot-product kernels
+# NPU targets get no fused Attention, an onnxruntime-only contrib op
+TARGET_EXPORT_SETTINGS = {
+    "rk3588": {
+        "opset_version": 13,
+        "static_shape": True,
+        "fuse_attention": False,
+        "quantize": False,
+        "bf16": False
+    },
+    "eic7700": {
+        "opset_version": 17,
+        "static_shape": True,
+        "fuse_attention": False,
+        "quantize": False,
+        "bf16": True
+    },
+    "cpu": {
+        "opset_version": 17,
+        "static_shape": False,
+        "fuse_attention": True,
+        "quantize": True,
+        "bf16": False
+    }
+}
+
+# Cached calibration mel spectrograms (see _build_calibration_set)
+CALIBRATION_DIR = Path.home() / ".cache" / "meetingassistant" / "calib"
+CALIBRATION_DATASET = "hf-internal-testing/librispeech_asr_dummy"
+
+
+# Model loads are cached so one process converting the same model to
+# several formats reads the checkpoint only once
+
+@functools.lru_cache(maxsize=4)
+def _load_whisper_model(model_size: str):
+    """Load a Whisper model in eval mode (cached)"""
+    import whisper
+
+    logger.info(f"Loading Whisper {model_size} model...")
+    model = whisper.load_model(model_size)
+    model.eval()
+    return model
+
+
+@functools.lru_cache(maxsize=4)
+def _load_qwen_model(model_name: str):
+    """Load a Qwen tokenizer and model in eval mode (cached)"""
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+
+    logger.info(f"Loading {model_name}...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        torch_dtype="auto",
+        trust_remote_code=True
+    )
+    model.eval()
+    return tokenizer, model
+
+
+def _export_onnx(
+    module,
+    args: tuple,
+    onnx_file: Path,
+    external_data: bool = False,
+    **export_kwargs
+) -> None:
+    """Export a PyTorch module to ONNX without autograd
+
+    With external_data the weights go to a single `<stem>.weights` file next
+    to the graph, which onnxruntime memory-maps when loading instead of
+    deserializing them with the protobuf. This is required above 2GB, where
+    torch writes one file per tensor; the export goes to a scratch
+    directory and is re-saved so those never land in the output directory.
+
+    Args:
+        module: Module to export (in eval mode)
+        args: Example inputs for tracing
+        onnx_file: Output path for the ONNX model
+        external_data: Store weights in an external data file
+        **export_kwargs: Passed to torch.onnx.export
+    """
+    import tempfile
+
+    import onnx
+    import torch
+
+    with tempfile.TemporaryDirectory(dir=onnx_file.parent) as tmp_dir:
+        tmp_file = Path(tmp_dir) / onnx_file.name
+
+        # Tracing needs no autograd state (inference_mode isn't used as the
+        # exporter can't trace inference tensors)
+        with torch.no_grad():
+            torch.onnx.export(module, args, str(tmp_file), **export_kwargs)
+
+        if external_data:
+            onnx.save_model(
+                onnx.load(str(tmp_file)),
+                str(onnx_file),
+                save_as_external_data=True,
+                all_tensors_to_one_file=True,
+                location=f"{onnx_file.stem}.weights",
+                size_threshold=1024,
+                convert_attribute=False
+            )
+        else:
+            os.replace(tmp_file, onnx_file)
+
+
+def _is_bf16_model(onnx_file: Path) -> bool:
+    """Check whether an ONNX model takes bfloat16 inputs
+
+    Args:
+        onnx_file: Path to ONNX model
+
+    Returns:
+        True if any graph input is bfloat16, False otherwise
+    """
+    try:
+        import onnx
+    except ImportError:
+        return False
+
+    graph = onnx.load(str(onnx_file), load_external_data=False).graph
+    return any(
+        inp.type.tensor_type.elem_type == onnx.TensorProto.BFLOAT16
+        for inp in graph.input
+    )
+
+
+def _build_calibration_set(n: int = 100) -> Optional[Path]:
+    """Build (once) a set of real speech mel spectrograms for calibration
+
+    Up to `n` LibriSpeech clips are converted with Whisper's own
+    log-mel front end and saved as (1, 80, 3000) float32 .npy files under
+    CALIBRATION_DIR, next to a dataset.txt index with one file per line.
+    That index is the format both the RKNN toolkit and EsQuant read.
+
+    Args:
+        n: Maximum number of calibration samples
+
+    Returns:
+        Path to dataset.txt or None if the set couldn't be built
+    """
+    index_file = CALIBRATION_DIR / "dataset.txt"
+    if index_file.exists():
+        return index_file
+
+    try:
+        import numpy as np
+        import whisper
+        from datasets import load_dataset
+
+        logger.info(f"Building calibration set from {CALIBRATION_DATASET}...")
+        dataset = load_dataset(CALIBRATION_DATASET, "clean", split="validation")
+
+        CALIBRATION_DIR.mkdir(parents=True, exist_ok=True)
+        mel_files = []
+        for i, sample in enumerate(dataset.select(range(min(n, len(dataset))))):
+            audio = whisper.pad_or_trim(sample['audio']['array'].astype(np.float32))
+            mel = whisper.log_mel_spectrogram(audio).numpy()[np.newaxis]
+
+            mel_file = CALIBRATION_DIR / f"mel_{i:03d}.npy"
+            np.save(mel_file, mel)
+            mel_files.append(str(mel_file))
+
+        # Written last, so an interrupted build is redone next time
+        index_file.write_text("\n".join(mel_files) + "\n")
+
+        logger.info(f"Calibration set with {len(mel_files)} samples saved to: {CALIBRATION_DIR}")
+        return index_file
+
+    except ImportError as e:
+        logger.warning(f"Cannot build calibration set ({e}), using synthetic data")
+        logger.info("Install with: pip install datasets")
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to build calibration set, using synthetic data: {e}")
+        return None
+
+
+def _mel_calibration_reader(
+    dataset: Optional[Path] = None,
+    count: int = 50,
+    n_frames: int = 3000
+):
+    """Calibration data for static quantization of the Whisper encoder
+
+    Yields the mel spectrograms listed in a dataset.txt index (see
+    _build_calibration_set), or without one `count` synthetic mel inputs
+    of the same shape as the export dummy input. Samples are loaded one
+    at a time so they are never all held in memory.
+
+    Args:
+        dataset: Optional path to a dataset.txt index of .npy mel files
+        count: Number of synthetic samples
+        n_frames: Time frames per synthetic sample
+
+    Returns:
+        onnxruntime CalibrationDataReader
+    """
+    import numpy as np
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class MelCalibrationDataReader(CalibrationDataReader):
+        def __init__(self):
+            if dataset is not None:
+                mel_files = dataset.read_text().split()
+                self._samples = (
+                    {'mel': np.load(mel_file).astype(np.float32)}
+                    for mel_file in mel_files
+                )
+            else:
+                rng = np.random.default_rng(0)
+                # Whisper's normalized log-mel features lie roughly in [-1, 1]
+                self._samples = (
+                    {'mel': rng.uniform(-1.0, 1.0, (1, 80, n_frames)).astype(np.float32)}
+                    for _ in range(count)
+                )
+
+        def get_next(self):
+            return next(self._samples, None)
+
+    return MelCalibrationDataReader()
+
+
+@functools.lru_cache(maxsize=1)
+def _ennp_tools_available() -> bool:
+    """Check if ENNP SDK tools are available (cached per process)"""
+    for tool in ENNP_TOOLS:
+        if shutil.which(tool) is None:
+            logger.warning(f"ENNP tool not found: {tool}")
+            return False
+    return True
+
+
+async def _run_tool(cmd: List[str], tail_lines: int = 20) -> Tuple[int, str]:
+    """Run an external tool, streaming its output to the log
+
+    Output is logged line by line as the tool runs instead of being
+    buffered, so long compiles show progress and memory use stays constant
+    however verbose the tool is. Only the last lines are kept for error
+    reporting.
+
+    Args:
+        cmd: Command and arguments
+        tail_lines: Number of trailing output lines to return
+
+    Returns:
+        Tuple of (return code, last output lines)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        # Progress bars redrawn with \r can make very long "lines"
+        limit=2 ** 20
+    )
+
+    tail = collections.deque(maxlen=tail_lines)
+    async for raw_line in proc.stdout:
+        line = raw_line.decode(errors='replace').rstrip()
+        logger.info(f"[{cmd[0]}] {line}")
+        tail.append(line)
+
+    returncode = await proc.wait()
+    return returncode, "\n".join(tail)
+
 
 class ModelConverter:
     """Convert models for NPU acceleration"""
 
     def __init__(self, npu_type: str = "auto"):
-        self.hardware = get_hardware_detector()
+        # Hardware detection probes the system, so it only runs when the
+        # target has to be auto-detected
+        self.hardware = None
 
         if npu_type == "auto":
+            if str(REPO_ROOT) not in sys.path:
+                sys.path.insert(0, str(REPO_ROOT))
+            from src.utils.hardware import get_hardware_detector
+
+            self.hardware = get_hardware_detector()
             self.npu_type = self.hardware.npu_type
         else:
             self.npu_type = npu_type
@@ -43,14 +340,36 @@ class ModelConverter:
         self,
         model_size: str = "base",
         output_dir: str = "./models/onnx",
-        quantize: bool = True
+        target: str = "cpu",
+        quantize: bool = True,
+        static_shape: bool = False,
+        fuse_attention: bool = True,
+        opset_version: int = 17,
+        bf16: bool = False
     ) -> Optional[str]:
         """Convert Whisper model to ONNX format
 
+        Exports two encoders: one with a dynamic n_frames axis for
+        onnxruntime, and a `_static` one fixed at 3000 frames for NPU
+        compilers, which can't map dynamic shapes onto the NPU and fall
+        back to CPU ops.
+
+        All files are named after the target, since exports for different
+        targets differ (opset, fusion) and may run at the same time.
+
         Args:
             model_size: Whisper model size (tiny, base, small, medium)
             output_dir: Output directory for ONNX model
+            target: Target the export is for (rk3588, eic7700, cpu)
             quantize: Whether to quantize the model
+            static_shape: Optimize, quantize and return the static-shape
+                export instead of the dynamic one
+            fuse_attention: Fuse each attention block into a single
+                Attention op (onnxruntime contrib op)
+            opset_version: ONNX opset to export with
+            bf16: Also export a BF16 copy of the static encoder and return
+                it instead (unquantized); the FP32 graph is still written
+                next to it as `<stem>.onnx`
 
         Returns:
             Path to converted ONNX model or None if failed
@@ -59,46 +378,97 @@ class ModelConverter:
 
         try:
             import torch
-            import whisper
 
-            # Load Whisper model
-            logger.info(f"Loading Whisper {model_size} model...")
-            model = whisper.load_model(model_size)
-            model.eval()
+            model = _load_whisper_model(model_size)
 
             # Create output directory
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
 
-            # ONNX file path
-            onnx_file = output_path / f"whisper_{model_size}.onnx"
+            # ONNX file paths
+            dynamic_file = output_path / f"whisper_{model_size}_{target}.onnx"
+            static_file = output_path / f"whisper_{model_size}_{target}_static.onnx"
 
             # Dummy input for tracing
             # Whisper encoder takes mel spectrogram (80 mel bands, variable time frames)
-            # Using a fixed size for export
-            dummy_mel = torch.randn(1, 80, 3000)  # batch_size=1, n_mels=80, n_frames=3000
+            # Using a fixed size for export; tracing only reads the shape, so
+            # zeros keep the exported graph deterministic
+            dummy_mel = torch.zeros(1, 80, 3000, dtype=torch.float32)  # batch_size=1, n_mels=80, n_frames=3000
+
+            # Large encoders (medium and up) keep their weights external
+            external_data = sum(
+                p.numel() * p.element_size() for p in model.encoder.parameters()
+            ) > EXTERNAL_DATA_THRESHOLD
 
             logger.info("Exporting encoder to ONNX...")
-            torch.onnx.export(
-                model.encoder,
-                dummy_mel,
-                str(onnx_file),
-                export_params=True,
-                opset_version=13,
-                do_constant_folding=True,
-                input_names=['mel'],
-                output_names=['encoder_output'],
-                dynamic_axes={
+            for export_path, dynamic_axes in (
+                (dynamic_file, {
                     'mel': {2: 'n_frames'},  # Variable time frames
                     'encoder_output': {1: 'n_frames'}
-                }
+                }),
+                (static_file, None)
+            ):
+                _export_onnx(
+                    model.encoder,
+                    (dummy_mel,),
+                    export_path,
+                    external_data=external_data,
+                    export_params=True,
+                    # 17+ exports LayerNormalization as one op instead of
+                    # a chain of primitives
+                    opset_version=opset_version,
+                    do_constant_folding=True,
+                    training=torch.onnx.TrainingMode.EVAL,
+                    # Weights stay initializers so they can be constant-folded
+                    keep_initializers_as_inputs=False,
+                    input_names=['mel'],
+                    output_names=['encoder_output'],
+                    dynamic_axes=dynamic_axes
+                )
+
+                logger.info(f"ONNX model saved to: {export_path}")
+
+            onnx_file = static_file if static_shape else dynamic_file
+
+            export_file = onnx_file
+            onnx_file = self._optimize_onnx(onnx_file, external_data=external_data) or onnx_file
+
+            if fuse_attention:
+                onnx_file = self._fuse_attention(
+                    onnx_file,
+                    num_heads=model.dims.n_audio_head,
+                    hidden_size=model.dims.n_audio_state,
+                    external_data=external_data
+                ) or onnx_file
+
+            # FP16 copy for backends with native fp16 MACs (RK3588 NPU,
+            # EIC7700); half the size, no calibration needed
+            self._convert_to_fp16(
+                onnx_file, export_file.with_name(f"{export_file.stem}_fp16.onnx")
             )
 
-            logger.info(f"ONNX model saved to: {onnx_file}")
+            # BF16 copy for the NPU bf16 path: half the weight bandwidth of
+            # FP32 with the same exponent range, and no calibration
+            if bf16:
+                bf16_file = self._export_bf16(
+                    model.encoder,
+                    onnx_file.with_name(f"{onnx_file.stem}_bf16.onnx"),
+                    opset_version=max(opset_version, 17),
+                    external_data=external_data
+                )
+                if bf16_file:
+                    return str(bf16_file)
 
             # Quantize if requested
             if quantize:
-                quantized_file = self._quantize_onnx(onnx_file)
+                calibration_reader = functools.partial(
+                    _mel_calibration_reader, dataset=_build_calibration_set()
+                )
+                quantized_file = self._quantize_onnx(
+                    onnx_file,
+                    calibration_reader=calibration_reader,
+                    external_data=external_data
+                )
                 if quantized_file:
                     return str(quantized_file)
 
@@ -116,6 +486,7 @@ class ModelConverter:
         self,
         model_name: str = "Qwen/Qwen2.5-3B-Instruct",
         output_dir: str = "./models/onnx",
+        target: str = "cpu",
         quantize: bool = True
     ) -> Optional[str]:
         """Convert Qwen model to ONNX format
@@ -123,6 +494,8 @@ class ModelConverter:
         Args:
             model_name: Hugging Face model name
             output_dir: Output directory for ONNX model
+            target: Target the export is for, used in the file name so
+                conversions for several targets don't share files
             quantize: Whether to quantize the model
 
         Returns:
@@ -131,17 +504,9 @@ class ModelConverter:
         logger.info(f"Converting Qwen model {model_name} to ONNX...")
 
         try:
-            from transformers import AutoTokenizer, AutoModelForCausalLM
-            from transformers.onnx import export as onnx_export
-
-            # Load model and tokenizer
-            logger.info(f"Loading {model_name}...")
-            tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
-            model = AutoModelForCausalLM.from_pretrained(
-                model_name,
-                torch_dtype="auto",
-                trust_remote_code=True
-            )
+            tokenizer, model = _load_qwen_model(model_name)
+            # Export the plain forward pass, without KV cache outputs
+            model.config.use_cache = False
 
             # Create output directory
             output_path = Path(output_dir)
@@ -149,14 +514,34 @@ class ModelConverter:
 
             # Simplified model name for file
             model_short_name = model_name.split('/')[-1].lower().replace('-', '_')
-            onnx_file = output_path / f"{model_short_name}.onnx"
+            onnx_file = output_path / f"{model_short_name}_{target}.onnx"
+
+            dummy = tokenizer("Meeting summary", return_tensors="pt")
 
             logger.info("Exporting to ONNX...")
-            logger.warning("Large language models may not fully support ONNX export")
-            logger.info("Consider using ONNX Runtime with optimizations instead")
+            _export_onnx(
+                model,
+                (dummy['input_ids'], dummy['attention_mask']),
+                onnx_file,
+                external_data=True,
+                opset_version=17,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['logits'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'logits': {0: 'batch', 1: 'sequence'}
+                },
+                do_constant_folding=True
+            )
 
-            # For now, recommend using ONNX Runtime directly with the model
-            logger.info("Alternative: Use model directly with ONNX Runtime ExecutionProvider")
+            logger.info(f"ONNX model saved to: {onnx_file}")
+
+            # Quantize if requested
+            if quantize:
+                quantized_file = self._quantize_onnx(onnx_file, external_data=True)
+                if quantized_file:
+                    return str(quantized_file)
 
             return str(onnx_file)
 
@@ -169,11 +554,220 @@ class ModelConverter:
             logger.info("Qwen models are best used with their native format + ONNX Runtime EP")
             return None
 
-    def _quantize_onnx(self, onnx_file: Path) -> Optional[Path]:
+    def _optimize_onnx(
+        self,
+        onnx_file: Path,
+        external_data: bool = False
+    ) -> Optional[Path]:
+        """Save an onnxruntime-optimized copy of an ONNX model
+
+        Applies the basic graph optimizations (constant folding, redundant
+        node elimination) once and persists the result, so downstream
+        RKNN/ENNP compilers get the simplified graph. Extended optimizations
+        are not used here since they introduce onnxruntime-only contrib ops
+        that NPU compilers can't load.
+
+        Args:
+            onnx_file: Path to ONNX model
+            external_data: Write weights to an external data file
+
+        Returns:
+            Path to optimized model or None if failed
+        """
+        try:
+            import onnxruntime as ort
+
+            optimized_file = onnx_file.parent / f"{onnx_file.stem}_optimized.onnx"
+
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+            sess_options.optimized_model_filepath = str(optimized_file)
+            if external_data:
+                sess_options.add_session_config_entry(
+                    "session.optimized_model_external_initializers_file_name",
+                    f"{optimized_file.stem}.weights"
+                )
+                sess_options.add_session_config_entry(
+                    "session.optimized_model_external_initializers_min_size_in_bytes",
+                    "1024"
+                )
+
+            # Creating the session runs the optimizer and writes the file
+            ort.InferenceSession(
+                str(onnx_file), sess_options, providers=['CPUExecutionProvider']
+            )
+
+            logger.info(f"Optimized model saved to: {optimized_file}")
+            return optimized_file
+
+        except ImportError:
+            logger.warning("onnxruntime not available for graph optimization")
+            return None
+        except Exception as e:
+            logger.warning(f"Graph optimization failed, using unoptimized model: {e}")
+            return None
+
+    def _fuse_attention(
+        self,
+        onnx_file: Path,
+        num_heads: int,
+        hidden_size: int,
+        external_data: bool = False
+    ) -> Optional[Path]:
+        """Save a copy of a transformer model with fused attention
+
+        The exported attention blocks are chains of MatMul/Div/Softmax/MatMul
+        ops that materialize every intermediate tensor; the onnxruntime
+        transformer optimizer rewrites each into one Attention node. The
+        Whisper encoder is close enough to BERT for its fusion patterns.
+
+        Args:
+            onnx_file: Path to ONNX model
+            num_heads: Number of attention heads
+            hidden_size: Model hidden size
+            external_data: Write weights to an external data file
+
+        Returns:
+            Path to fused model or None if failed
+        """
+        try:
+            from onnxruntime.transformers.optimizer import optimize_model
+
+            fused_file = onnx_file.parent / f"{onnx_file.stem}_fused.onnx"
+
+            # opt_level=0: only the Python fusion passes, the graph was
+            # already run through the onnxruntime optimizer
+            optimizer = optimize_model(
+                str(onnx_file),
+                model_type='bert',
+                num_heads=num_heads,
+                hidden_size=hidden_size,
+                opt_level=0
+            )
+            fused_ops = optimizer.get_fused_operator_statistics()
+            if not fused_ops.get('Attention'):
+                logger.warning("No attention blocks fused, keeping unfused model")
+                return None
+
+            optimizer.save_model_to_file(
+                str(fused_file), use_external_data_format=external_data
+            )
+
+            logger.info(f"Fused {fused_ops['Attention']} attention blocks, saved to: {fused_file}")
+            return fused_file
+
+        except ImportError:
+            logger.warning("onnxruntime not available for attention fusion")
+            return None
+        except Exception as e:
+            logger.warning(f"Attention fusion failed, using unfused model: {e}")
+            return None
+
+    def _export_bf16(
+        self,
+        encoder,
+        output_file: Path,
+        opset_version: int = 17,
+        external_data: bool = False
+    ) -> Optional[Path]:
+        """Export a static-shape BF16 copy of the Whisper encoder
+
+        The encoder is cast on a copy, since the loaded model is cached and
+        shared with the FP32 exports. The graph is not optimized, fused or
+        quantized: those steps run through onnxruntime, whose CPU provider
+        has no bfloat16 kernels for most ops.
+
+        Args:
+            encoder: Whisper encoder module
+            output_file: Output path for the BF16 model
+            opset_version: ONNX opset to export with
+            external_data: Store weights in an external data file
+
+        Returns:
+            Path to BF16 model or None if failed
+        """
+        try:
+            import copy
+            import torch
+
+            bf16_encoder = copy.deepcopy(encoder).to(torch.bfloat16)
+            dummy_mel = torch.zeros(1, 80, 3000, dtype=torch.bfloat16)
+
+            _export_onnx(
+                bf16_encoder,
+                (dummy_mel,),
+                output_file,
+                external_data=external_data,
+                export_params=True,
+                opset_version=opset_version,
+                do_constant_folding=True,
+                training=torch.onnx.TrainingMode.EVAL,
+                keep_initializers_as_inputs=False,
+                input_names=['mel'],
+                output_names=['encoder_output']
+            )
+
+            logger.info(f"BF16 model saved to: {output_file}")
+            return output_file
+
+        except Exception as e:
+            logger.warning(f"BF16 export failed, using the FP32 model: {e}")
+            return None
+
+    def _convert_to_fp16(self, onnx_file: Path, output_file: Path) -> Optional[Path]:
+        """Save an FP16-weight copy of an ONNX model
+
+        Inputs and outputs stay FP32, and LayerNormalization/Softmax are kept
+        in FP32 since they lose accuracy at half precision.
+
+        Args:
+            onnx_file: Path to FP32 ONNX model
+            output_file: Output path for the FP16 model
+
+        Returns:
+            Path to FP16 model or None if failed
+        """
+        try:
+            import onnx
+            from onnxconverter_common import float16
+
+            model = float16.convert_float_to_float16(
+                onnx.load(str(onnx_file)),
+                keep_io_types=True,
+                op_block_list=["LayerNormalization", "Softmax"]
+            )
+            onnx.save(model, str(output_file))
+
+            logger.info(f"FP16 model saved to: {output_file}")
+            return output_file
+
+        except ImportError:
+            logger.info("onnxconverter-common not available, skipping FP16 model")
+            return None
+        except Exception as e:
+            logger.warning(f"FP16 conversion failed: {e}")
+            return None
+
+    def _quantize_onnx(
+        self,
+        onnx_file: Path,
+        calibration_reader: Optional[Callable] = None,
+        external_data: bool = False
+    ) -> Optional[Path]:
         """Quantize ONNX model to INT8
 
+        With a calibration reader the model is statically quantized to
+        signed INT8 (QDQ format, symmetric per-channel weights), which maps
+        onto the int8 dot-product kernels (VNNI / ARM dotprod). Dynamic
+        quantization often falls back to slower generic kernels, so it is
+        only used when no calibration data is available.
+
         Args:
             onnx_file: Path to ONNX model
+            calibration_reader: Optional factory returning an onnxruntime
+                CalibrationDataReader that yields representative inputs
+            external_data: Keep weights in an external data file, required
+                for models over the 2GB protobuf limit
 
         Returns:
             Path to quantized model or None if failed
@@ -181,15 +775,53 @@ class ModelConverter:
         logger.info("Quantizing ONNX model to INT8...")
 
         try:
-            from onnxruntime.quantization import quantize_dynamic, QuantType
+            from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+            from onnxruntime.quantization.shape_inference import quant_pre_process
 
             quantized_file = onnx_file.parent / f"{onnx_file.stem}_quantized.onnx"
 
-            quantize_dynamic(
-                str(onnx_file),
-                str(quantized_file),
-                weight_type=QuantType.QUInt8
-            )
+            # Quantize the optimized, shape-inferred graph: fusing and
+            # constant folding first gives a faster result and avoids some
+            # quantizer failures on unfused patterns
+            preprocessed_file = onnx_file.parent / f"{onnx_file.stem}_preprocessed.onnx"
+            preprocessed_data = preprocessed_file.with_name(f"{preprocessed_file.stem}.weights")
+            try:
+                # onnxruntime can't optimize models over 2GB, so large
+                # models only get shape inference here
+                quant_pre_process(
+                    str(onnx_file),
+                    str(preprocessed_file),
+                    skip_optimization=external_data,
+                    skip_onnx_shape=False,
+                    skip_symbolic_shape=False,
+                    save_as_external_data=external_data,
+                    all_tensors_to_one_file=True,
+                    external_data_location=preprocessed_data.name
+                )
+
+                if calibration_reader is None:
+                    # Only the matmul-type ops: dynamically quantized Conv
+                    # becomes ConvInteger (u8u8), which has no fast kernel
+                    # and ends up slower than FP32
+                    self._quantize_dynamic_with_fallback(
+                        preprocessed_file, quantized_file, external_data
+                    )
+                else:
+                    logger.info("Calibrating activation ranges...")
+                    quantize_static(
+                        str(preprocessed_file),
+                        str(quantized_file),
+                        calibration_reader(),
+                        quant_format=QuantFormat.QDQ,
+                        activation_type=QuantType.QInt8,
+                        weight_type=QuantType.QInt8,
+                        per_channel=True,
+                        reduce_range=False,
+                        use_external_data_format=external_data
+                    )
+            finally:
+                preprocessed_file.unlink(missing_ok=True)
+                preprocessed_data.unlink(missing_ok=True)
 
             logger.info(f"Quantized model saved to: {quantized_file}")
             return quantized_file
@@ -201,12 +833,100 @@ class ModelConverter:
             logger.error(f"Quantization failed: {e}")
             return None
 
-    def convert_to_rknn(self, onnx_file: str, output_file: str) -> bool:
+    def _quantize_dynamic_with_fallback(
+        self,
+        model_input: Path,
+        model_output: Path,
+        external_data: bool = False
+    ) -> None:
+        """Dynamically quantize a model, retrying with safer settings
+
+        Starts with signed per-channel INT8 weights and checks that
+        onnxruntime can load the result. Known onnxruntime CPU quantization
+        bugs are worked around by retrying: per-channel/3D tensor errors
+        with per-tensor weights, and VNNI or load failures with reduced
+        (7-bit) range. The settings that worked are logged, so they can be
+        pinned for future runs.
+
+        Args:
+            model_input: Path to preprocessed ONNX model
+            model_output: Output path for the quantized model
+            external_data: Keep weights in an external data file
+
+        Raises:
+            Exception: The last quantization or load error if no settings work
+        """
+        import onnxruntime as ort
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        settings = {'per_channel': True, 'reduce_range': False}
+
+        while True:
+            try:
+                # Only the matmul-type ops: dynamically quantized Conv
+                # becomes ConvInteger (u8u8), which has no fast kernel and
+                # ends up slower than FP32
+                quantize_dynamic(
+                    str(model_input),
+                    str(model_output),
+                    op_types_to_quantize=DYNAMIC_QUANT_OP_TYPES,
+                    weight_type=QuantType.QInt8,
+                    use_external_data_format=external_data,
+                    **settings
+                )
+            except Exception as e:
+                stage, error = "quantization", e
+            else:
+                # Some quantizer bugs only show up as kernel errors when
+                # the quantized model is loaded
+                try:
+                    ort.InferenceSession(
+                        str(model_output), providers=['CPUExecutionProvider']
+                    )
+                except Exception as e:
+                    stage, error = "model load", e
+                else:
+                    logger.info(
+                        f"Dynamic quantization succeeded with weight_type=QInt8, "
+                        f"per_channel={settings['per_channel']}, "
+                        f"reduce_range={settings['reduce_range']}"
+                    )
+                    return
+
+            message = str(error).lower()
+            if settings['per_channel'] and any(
+                key in message for key in ("per-channel", "per_channel", "3d")
+            ):
+                settings['per_channel'] = False
+            elif not settings['reduce_range'] and (
+                stage == "model load" or "vnni" in message
+            ):
+                settings['reduce_range'] = True
+            else:
+                raise error
+
+            logger.warning(
+                f"Dynamic quantization {stage} failed ({error}), retrying with "
+                f"per_channel={settings['per_channel']}, "
+                f"reduce_range={settings['reduce_range']}"
+            )
+
+    def convert_to_rknn(
+        self,
+        onnx_file: Union[str, Path],
+        output_file: Union[str, Path],
+        mean_values: Optional[list] = None,
+        std_values: Optional[list] = None,
+        dataset: Optional[Path] = None
+    ) -> bool:
         """Convert ONNX model to RKNN format for RK3588
 
         Args:
-            onnx_file: Path to ONNX model
+            onnx_file: Path to static-shape ONNX model
             output_file: Output path for RKNN model
+            mean_values: Per-channel input mean for normalization
+            std_values: Per-channel input std for normalization
+            dataset: Optional dataset.txt index of calibration inputs
 
         Returns:
             True if successful, False otherwise
@@ -219,23 +939,34 @@ class ModelConverter:
             # Create RKNN object
             rknn = RKNN(verbose=True)
 
+            rknn.config(
+                mean_values=mean_values,
+                std_values=std_values,
+                target_platform='rk3588'
+            )
+
             # Load ONNX model
             logger.info("Loading ONNX model...")
-            ret = rknn.load_onnx(model=onnx_file)
+            ret = rknn.load_onnx(model=str(onnx_file))
             if ret != 0:
                 logger.error("Failed to load ONNX model")
                 return False
 
-            # Build model
+            # Build model; int8 quantization needs calibration data,
+            # without it the model is built in fp16
             logger.info("Building RKNN model...")
-            ret = rknn.build(do_quantization=True)
+            ret = rknn.build(
+                do_quantization=dataset is not None,
+                dataset=str(dataset) if dataset else None,
+                rknn_batch_size=1
+            )
             if ret != 0:
                 logger.error("Failed to build RKNN model")
                 return False
 
             # Export RKNN model
             logger.info(f"Exporting to {output_file}...")
-            ret = rknn.export_rknn(output_file)
+            ret = rknn.export_rknn(str(output_file))
             if ret != 0:
                 logger.error("Failed to export RKNN model")
                 return False
@@ -252,12 +983,20 @@ class ModelConverter:
             logger.error(f"RKNN conversion failed: {e}")
             return False
 
-    def convert_to_ennp(self, onnx_file: str, output_file: str) -> bool:
+    def convert_to_ennp(
+        self,
+        onnx_file: Union[str, Path],
+        output_file: Union[str, Path],
+        dataset: Optional[Path] = None,
+        quantize: bool = True
+    ) -> bool:
         """Convert ONNX model to ENNP format for EIC7700
 
         Args:
             onnx_file: Path to ONNX model
             output_file: Output path for ENNP model
+            dataset: Optional dataset.txt index of calibration inputs
+            quantize: Quantize to int8 with EsQuant before compiling
 
         Returns:
             True if successful, False otherwise
@@ -271,57 +1010,168 @@ class ModelConverter:
             return False
 
         try:
-            # Step 1: Quantize with EsQuant
-            quantized_file = f"{onnx_file.replace('.onnx', '_quant.onnx')}"
+            return asyncio.run(
+                self._run_ennp_pipeline(
+                    Path(onnx_file), Path(output_file), dataset, quantize
+                )
+            )
+
+        except Exception as e:
+            logger.error(f"ENNP conversion failed: {e}")
+            return False
+
+    async def _run_ennp_pipeline(
+        self,
+        onnx_file: Path,
+        output_file: Path,
+        dataset: Optional[Path] = None,
+        quantize: bool = True
+    ) -> bool:
+        """Run the EsQuant -> EsAAC tool chain
+
+        Args:
+            onnx_file: Path to ONNX model
+            output_file: Output path for ENNP model
+            dataset: Optional dataset.txt index of calibration inputs
+            quantize: Quantize to int8 with EsQuant before compiling
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # Step 1: Quantize with EsQuant
+        quantized_file = onnx_file
+        if quantize:
+            quantized_file = onnx_file.with_name(f"{onnx_file.stem}_quant.onnx")
             logger.info("Quantizing model with EsQuant...")
 
             quant_cmd = [
                 "esquant",
-                "--model", onnx_file,
-                "--output", quantized_file,
+                "--model", str(onnx_file),
+                "--output", str(quantized_file),
                 "--quantize_type", "int8"
             ]
+            if dataset:
+                quant_cmd += ["--calibration_data", str(dataset)]
 
-            result = subprocess.run(quant_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.warning(f"Quantization failed: {result.stderr}")
+            returncode, output = await _run_tool(quant_cmd)
+            if returncode != 0:
+                logger.warning(f"Quantization failed: {output}")
                 quantized_file = onnx_file  # Use original
 
-            # Step 2: Compile with EsAAC
-            logger.info("Compiling model with EsAAC...")
-            compile_cmd = [
-                "esaac",
-                "--model", quantized_file,
-                "--output", output_file,
-                "--target", "eic7700"
-            ]
+        # Step 2: Compile with EsAAC
+        logger.info("Compiling model with EsAAC...")
+        compile_cmd = [
+            "esaac",
+            "--model", str(quantized_file),
+            "--output", str(output_file),
+            "--target", "eic7700"
+        ]
+
+        returncode, output = await _run_tool(compile_cmd)
+        if returncode != 0:
+            logger.error(f"Compilation failed: {output}")
+            return False
 
-            result = subprocess.run(compile_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"Compilation failed: {result.stderr}")
-                return False
+        logger.info("Successfully converted to ENNP format")
+        return True
+
+    def _check_ennp_tools(self) -> bool:
+        """Check if ENNP SDK tools are available"""
+        return _ennp_tools_available()
 
-            logger.info("Successfully converted to ENNP format")
+    def _validate_onnx(self, onnx_file: Path) -> bool:
+        """Check an ONNX model and run it once with onnxruntime
+
+        Runs the ONNX checker with full shape inference, then a single
+        inference on zero inputs (symbolic dimensions set to 1), so graph
+        problems are reported clearly before handing the model to an NPU
+        compiler.
+
+        Args:
+            onnx_file: Path to ONNX model
+
+        Returns:
+            True if the model is valid or can't be checked, False otherwise
+        """
+        logger.info(f"Validating {onnx_file}...")
+
+        try:
+            import numpy as np
+            import onnx
+            import onnxruntime as ort
+        except ImportError:
+            logger.warning("onnx/onnxruntime not available, skipping model validation")
             return True
 
+        ort_dtypes = {
+            'tensor(float)': np.float32,
+            'tensor(float16)': np.float16,
+            'tensor(double)': np.float64,
+            'tensor(int64)': np.int64,
+            'tensor(int32)': np.int32,
+            'tensor(bool)': np.bool_
+        }
+
+        try:
+            # Checking by path also handles models with external data
+            onnx.checker.check_model(str(onnx_file), full_check=True)
         except Exception as e:
-            logger.error(f"ENNP conversion failed: {e}")
+            logger.error(f"ONNX checker failed: {e}")
             return False
 
-    def _check_ennp_tools(self) -> bool:
-        """Check if ENNP SDK tools are available"""
-        tools = ["esquant", "esaac"]
-        for tool in tools:
-            if subprocess.run(["which", tool], capture_output=True).returncode != 0:
-                logger.warning(f"ENNP tool not found: {tool}")
-                return False
+        if _is_bf16_model(onnx_file):
+            logger.info(
+                "Skipping onnxruntime smoke test for BF16 model "
+                "(no bfloat16 CPU kernels)"
+            )
+            return True
+
+        try:
+            session = ort.InferenceSession(
+                str(onnx_file), providers=['CPUExecutionProvider']
+            )
+            inputs = {
+                inp.name: np.zeros(
+                    [dim if isinstance(dim, int) else 1 for dim in inp.shape],
+                    dtype=ort_dtypes.get(inp.type, np.float32)
+                )
+                for inp in session.get_inputs()
+            }
+            session.run(None, inputs)
+        except Exception as e:
+            logger.error(f"onnxruntime smoke test failed: {e}")
+            return False
+
+        logger.info("ONNX model is valid")
         return True
 
+    def _export_for_target(self, target_format: str) -> dict:
+        """Get the Whisper export settings for a target format
+
+        Each NPU compiler gets an ONNX graph it can compile in full instead
+        of one generic export (see TARGET_EXPORT_SETTINGS).
+
+        Args:
+            target_format: Target format (onnx, rknn, ennp)
+
+        Returns:
+            Keyword arguments for convert_whisper_to_onnx
+        """
+        target = self._target_name(target_format)
+        logger.info(f"Using {target} export settings")
+        return dict(TARGET_EXPORT_SETTINGS[target], target=target)
+
+    @staticmethod
+    def _target_name(target_format: str) -> str:
+        """Map a target format (onnx, rknn, ennp) to its target name"""
+        return {"rknn": "rk3588", "ennp": "eic7700"}.get(target_format, "cpu")
+
     def convert_model(
         self,
         model_type: str,
         model_size: str,
-        target_format: str = "auto"
+        target_format: str = "auto",
+        output_dir: str = "./models/onnx"
     ) -> bool:
         """Convert model to target NPU format
 
@@ -329,6 +1179,7 @@ class ModelConverter:
             model_type: Type of model (whisper, qwen)
             model_size: Model size/name
             target_format: Target format (onnx, rknn, ennp, auto)
+            output_dir: Output directory for the converted files
 
         Returns:
             True if successful, False otherwise
@@ -346,9 +1197,13 @@ class ModelConverter:
 
         # Step 1: Convert to ONNX
         if model_type == "whisper":
-            onnx_file = self.convert_whisper_to_onnx(model_size)
+            onnx_file = self.convert_whisper_to_onnx(
+                model_size, output_dir, **self._export_for_target(target_format)
+            )
         elif model_type == "qwen":
-            onnx_file = self.convert_qwen_to_onnx(model_size)
+            onnx_file = self.convert_qwen_to_onnx(
+                model_size, output_dir, target=self._target_name(target_format)
+            )
         else:
             logger.error(f"Unknown model type: {model_type}")
             return False
@@ -361,19 +1216,145 @@ class ModelConverter:
             logger.info("ONNX conversion complete")
             return True
 
-        elif target_format == "rknn":
-            output_file = onnx_file.replace(".onnx", ".rknn")
+        # NPU compiler errors are opaque, so catch broken graphs here first
+        if not self._validate_onnx(Path(onnx_file)):
+            return False
+
+        # Real speech calibrates the NPU int8 quantizers for Whisper
+        dataset = _build_calibration_set() if model_type == "whisper" else None
+
+        if target_format == "rknn":
+            output_file = Path(onnx_file).with_suffix(".rknn")
+            if model_type == "whisper":
+                # Mel features are already normalized
+                return self.convert_to_rknn(
+                    onnx_file, output_file,
+                    mean_values=[[0] * 80], std_values=[[1] * 80],
+                    dataset=dataset
+                )
             return self.convert_to_rknn(onnx_file, output_file)
 
         elif target_format == "ennp":
-            output_file = onnx_file.replace(".onnx", ".ennp")
-            return self.convert_to_ennp(onnx_file, output_file)
+            output_file = Path(onnx_file).with_suffix(".ennp")
+            if not _is_bf16_model(Path(onnx_file)):
+                return self.convert_to_ennp(onnx_file, output_file, dataset=dataset)
+
+            # BF16 runs natively on the NPU, so it skips int8 quantization;
+            # fall back to the FP32 graph if EsAAC can't compile it
+            if self.convert_to_ennp(onnx_file, output_file, quantize=False):
+                return True
+            fp32_file = Path(onnx_file).with_name(
+                f"{Path(onnx_file).stem.removesuffix('_bf16')}.onnx"
+            )
+            logger.warning(f"BF16 compile failed, retrying with {fp32_file}")
+            if not self._validate_onnx(fp32_file):
+                return False
+            return self.convert_to_ennp(
+                fp32_file, fp32_file.with_suffix(".ennp"), dataset=dataset
+            )
 
         else:
             logger.error(f"Unknown target format: {target_format}")
             return False
 
 
+def load_batch_config(config_file: str) -> List[Tuple[str, str, str]]:
+    """Load a list of conversion jobs from a JSON or YAML file
+
+    The file holds a list of entries such as
+    ``{"model": "whisper", "size": "base", "format": "rknn"}``;
+    ``format`` defaults to ``auto``.
+
+    Args:
+        config_file: Path to JSON or YAML batch file
+
+    Returns:
+        List of (model, size, format) tuples
+    """
+    path = Path(config_file)
+    with open(path, 'r') as f:
+        if path.suffix in ('.yaml', '.yml'):
+            import yaml
+            entries = yaml.safe_load(f)
+        else:
+            entries = json.load(f)
+
+    return [
+        (entry['model'], str(entry['size']), entry.get('format', 'auto'))
+        for entry in entries
+    ]
+
+
+def _convert_job(
+    npu_type: str,
+    output_dir: str,
+    model_type: str,
+    model_size: str,
+    target_format: str
+) -> bool:
+    """Run one conversion in a worker process"""
+    converter = ModelConverter(npu_type=npu_type)
+    return converter.convert_model(model_type, model_size, target_format, output_dir)
+
+
+def convert_batch(
+    jobs: List[Tuple[str, str, str]],
+    npu_type: str = "auto",
+    max_workers: Optional[int] = None,
+    output_dir: str = "./models/onnx"
+) -> bool:
+    """Convert several models in parallel worker processes
+
+    Conversions of different models are independent, so each one runs in
+    its own process; the ENNP/RKNN compile steps of one model overlap with
+    the export of the next. Output files are named per target, so jobs for
+    the same model and different targets don't share files.
+
+    Args:
+        jobs: List of (model, size, format) tuples
+        npu_type: Target NPU type
+        output_dir: Output directory for the converted files
+        max_workers: Number of worker processes (default: half the CPUs)
+
+    Returns:
+        True if all conversions succeeded, False otherwise
+    """
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+
+    # Build the shared calibration set up front so workers don't race to
+    # write the same files
+    if any(model_type == "whisper" for model_type, _, _ in jobs):
+        _build_calibration_set()
+
+    logger.info(f"Converting {len(jobs)} models with {max_workers} workers...")
+
+    # Spawn rather than fork: forking a process with torch threads running
+    # can deadlock
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            executor.submit(_convert_job, npu_type, output_dir, *job): job
+            for job in jobs
+        }
+
+    all_ok = True
+    for future, (model_type, model_size, target_format) in futures.items():
+        try:
+            ok = future.result()
+        except Exception as e:
+            logger.error(f"{model_type} {model_size} worker failed: {e}")
+            ok = False
+
+        status = "ok" if ok else "FAILED"
+        logger.info(f"{model_type} {model_size} -> {target_format}: {status}")
+        all_ok = all_ok and ok
+
+    return all_ok
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
@@ -392,22 +1373,36 @@ Examples:
 
   # Auto-detect NPU and convert
   python convert_models_npu.py --model whisper --size base --format auto
+
+  # Convert every model listed in a batch file in parallel
+  python convert_models_npu.py --batch models.json --jobs 2
         """
     )
 
     parser.add_argument(
         '--model', '-m',
-        required=True,
         choices=['whisper', 'qwen'],
         help='Model type to convert'
     )
 
     parser.add_argument(
         '--size', '-s',
-        required=True,
         help='Model size (e.g., base, small, medium for Whisper)'
     )
 
+    parser.add_argument(
+        '--batch', '-b',
+        metavar='CONFIG',
+        help='JSON/YAML file listing models to convert in parallel'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Parallel conversions for --batch (default: half the CPUs)'
+    )
+
     parser.add_argument(
         '--format', '-f',
         default='auto',
@@ -424,8 +1419,8 @@ Examples:
 
     parser.add_argument(
         '--output', '-o',
-        default='./models',
-        help='Output directory (default: ./models)'
+        default='./models/onnx',
+        help='Output directory (default: ./models/onnx)'
     )
 
     parser.add_argument(
@@ -436,14 +1431,25 @@ Examples:
 
     args = parser.parse_args()
 
+    if not args.batch and not (args.model and args.size):
+        parser.error("--model and --size are required unless --batch is given")
+
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    # Create converter
-    converter = ModelConverter(npu_type=args.npu)
+    if args.batch:
+        success = convert_batch(
+            load_batch_config(args.batch), npu_type=args.npu,
+            max_workers=args.jobs, output_dir=args.output
+        )
+    else:
+        # Create converter
+        converter = ModelConverter(npu_type=args.npu)
 
-    # Convert model
-    success = converter.convert_model(args.model, args.size, args.format)
+        # Convert model
+        success = converter.convert_model(
+            args.model, args.size, args.format, output_dir=args.output
+        )
 
     if success:
         logger.info("✅ Model conversion successful!")
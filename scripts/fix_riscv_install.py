@@ -6,11 +6,76 @@ Automatically fixes SciPy/gfortran installation issues on RISC-V
 
 import os
 import sys
+import json
 import subprocess
+import argparse
+import importlib.util
 import platform
+import shlex
+import shutil
 import time
+import tempfile
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Whether the script runs inside a virtual environment
+IN_VENV = hasattr(sys, 'real_prefix') or (
+    hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix
+)
+
+# pip of the running interpreter (venv or system); running it as a module
+# avoids going through a separate pip script
+PIP_COMMAND = [sys.executable, "-m", "pip"]
+
+# Core packages that should work on RISC-V
+CORE_PACKAGES = {
+    'transformers': 'Hugging Face Transformers',
+    'fastapi': 'FastAPI web framework',
+    'uvicorn': 'ASGI server',
+    'jinja2': 'Template engine',
+    'click': 'CLI framework',
+    'rich': 'Terminal formatting',
+    'pyyaml': 'YAML parser',
+    'requests': 'HTTP library'
+}
+
+# Answer every prompt with its default (set by --yes or MA_ASSUME_YES=1),
+# for unattended installs
+ASSUME_YES = os.environ.get("MA_ASSUME_YES") == "1"
+
+# Answers from earlier runs, reused for a day so reruns while debugging a
+# failed install don't ask again (ignored with --force)
+STATE_FILE = Path.home() / ".cache" / "meetingassistant-install" / "state.json"
+STATE_MAX_AGE = 24 * 60 * 60
+IGNORE_STATE = False
+
+# Sudo access is checked once per run; the sudo ticket itself can expire,
+# so it is never saved across runs
+_SUDO_OK = False
+
+# Package versions (or None) found by verify_installation, reused by the
+# summary instead of probing again
+PROBE_RESULTS = {}
+
+# Persistent pip cache and wheel directory, so wheels compiled from source
+# (NumPy/SciPy take 10-30 minutes on RISC-V) are reused when the script is
+# run again
+PIP_CACHE = Path.home() / ".cache" / "meetingassistant-pip"
+WHEEL_CACHE = Path.home() / ".cache" / "meetingassistant-wheels"
+PIP_CACHE.mkdir(parents=True, exist_ok=True)
+os.environ["PIP_CACHE_DIR"] = str(PIP_CACHE)
+
+# pip's --verbose echoes every compiler call of a source build, which slows
+# builds down on SD card roots and serial consoles; opt in with MA_PIP_VERBOSE=1
+PIP_VERBOSE = ["--verbose"] if os.environ.get("MA_PIP_VERBOSE") else []
+
+# Additional package index with pre-built RISC-V wheels (a community index
+# or one hosted locally); when it has a wheel, pip skips the source build
+EXTRA_INDEX_URL = os.environ.get("MA_EXTRA_INDEX_URL", "")
+EXTRA_INDEX = ["--extra-index-url", EXTRA_INDEX_URL] if EXTRA_INDEX_URL else []
+
 # ANSI color codes
 class Colors:
     RED = '\033[0;31m'
@@ -29,6 +94,10 @@ def print_banner():
 ║         Fixes SciPy/gfortran Issues                          ║
 ║                                                               ║
 ╚═══════════════════════════════════════════════════════════════╝{Colors.NC}
+
+  Set MA_EXTRA_INDEX_URL to an index with pre-built RISC-V wheels, e.g.
+    devpi:      http://<host>:3141/root/pypi/+simple/
+    pypiserver: http://<host>:8080/simple/
     """
     print(banner)
 
@@ -44,17 +113,89 @@ def print_error(message: str):
 def print_info(message: str):
     print(f"{Colors.BLUE}[i]{Colors.NC} {message}")
 
-def run_command(cmd, check=True, shell=False, timeout=None):
-    """Run a command and return result"""
+def stream_command(cmd, shell=False, timeout=None, tail_lines=200, heartbeat=60, env=None):
+    """Run a command, echoing its output live
+
+    Only the last `tail_lines` lines are kept for error reporting, so memory
+    stays bounded however much the command prints (a SciPy build prints
+    hundreds of MB). When the command prints nothing for `heartbeat`
+    seconds, a progress note is shown so long quiet builds don't look hung.
+
+    Returns:
+        CompletedProcess with the output tail as stdout and stderr
+    """
+    tail = collections.deque(maxlen=tail_lines)
+
+    sys.stdout.flush()
+    proc = subprocess.Popen(
+        cmd,
+        shell=shell,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env
+    )
+
+    # Reading blocks until the command exits, so the timeout kills it
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        proc.kill()
+
+    start_time = last_output = time.monotonic()
+    done = threading.Event()
+
+    def report_progress():
+        while not done.wait(heartbeat):
+            if time.monotonic() - last_output >= heartbeat:
+                minutes = int((time.monotonic() - start_time) / 60)
+                print_info(f"Still running... ({minutes} min)")
+
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+    threading.Thread(target=report_progress, daemon=True).start()
+    try:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+            tail.append(line)
+            last_output = time.monotonic()
+        returncode = proc.wait()
+    finally:
+        done.set()
+        if timer:
+            timer.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    output = "".join(tail)
+    return subprocess.CompletedProcess(cmd, returncode, stdout=output, stderr=output)
+
+def run_command(cmd, check=True, shell=False, timeout=None, stream=False, env=None):
+    """Run a command and return result
+
+    With stream=True the output is shown live instead of captured (see
+    stream_command).
+    """
     try:
-        if shell:
+        if stream:
+            result = stream_command(cmd, shell=shell, timeout=timeout, env=env)
+            if check and result.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    result.returncode, cmd, output=result.stdout, stderr=result.stderr
+                )
+        elif shell:
             result = subprocess.run(
                 cmd,
                 shell=True,
                 check=check,
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                env=env
             )
         else:
             result = subprocess.run(
@@ -62,7 +203,8 @@ def run_command(cmd, check=True, shell=False, timeout=None):
                 check=check,
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                env=env
             )
         return result
     except subprocess.CalledProcessError as e:
@@ -75,7 +217,38 @@ def run_command(cmd, check=True, shell=False, timeout=None):
         print_error("Command timed out")
         raise
 
-def check_architecture():
+def load_state():
+    """Load the answers saved by recent runs"""
+    if IGNORE_STATE:
+        return {}
+    try:
+        if time.time() - STATE_FILE.stat().st_mtime > STATE_MAX_AGE:
+            return {}
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_state(key, value):
+    """Save an answer for later runs"""
+    state = load_state()
+    state[key] = value
+    try:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATE_FILE.write_text(json.dumps(state))
+    except OSError:
+        pass
+
+def confirm(prompt, default=True):
+    """Ask a yes/no question, or take the default in unattended mode"""
+    if ASSUME_YES:
+        return default
+
+    response = input(prompt).strip().lower()
+    if not response:
+        return default
+    return response in ['y', 'yes']
+
+def check_architecture(assume_riscv=False):
     """Check if running on RISC-V"""
     print_info("Checking system architecture...")
     arch = platform.machine().lower()
@@ -84,13 +257,40 @@ def check_architecture():
     if arch in ["riscv64", "riscv"]:
         print_status("RISC-V architecture detected")
         return True
+    elif assume_riscv:
+        print_warning(f"Not RISC-V architecture (detected: {arch}), continuing as requested")
+        return True
+    elif load_state().get("architecture") == arch:
+        print_warning(f"Not RISC-V architecture (detected: {arch}), confirmed in an earlier run")
+        return True
     else:
         print_warning(f"Not RISC-V architecture (detected: {arch})")
-        response = input("Continue anyway? (y/N): ").strip().lower()
-        return response in ['y', 'yes']
+        if confirm("Continue anyway? (y/N): ", default=False):
+            save_state("architecture", arch)
+            return True
+        return False
+
+def sudo_prefix():
+    """Command prefix for running as root: sudo, or nothing if already root"""
+    return [] if os.geteuid() == 0 else ["sudo"]
 
 def check_sudo():
-    """Check if user has sudo privileges"""
+    """Check if user has sudo privileges (once per run)"""
+    global _SUDO_OK
+    if _SUDO_OK:
+        return True
+
+    # Root (e.g. container builds) needs no sudo, which may not even be
+    # installed there
+    if os.geteuid() == 0:
+        print_status("Running as root - no sudo needed")
+        _SUDO_OK = True
+        return True
+
+    if shutil.which("sudo") is None:
+        print_warning("sudo is not installed - run this script as root instead")
+        return False
+
     print_info("Checking sudo privileges...")
     result = run_command(["sudo", "-n", "true"], check=False)
 
@@ -100,12 +300,31 @@ def check_sudo():
         result = run_command(["sudo", "true"])
 
     print_status("Sudo access confirmed")
+    _SUDO_OK = True
     return True
 
-def check_package_installed(package):
-    """Check if a system package is installed"""
-    result = run_command(["dpkg", "-l", package], check=False)
-    return result.returncode == 0
+def get_installed_packages(packages):
+    """Check which system packages are installed
+
+    Queries all packages with a single dpkg-query call instead of one
+    dpkg run (each parsing the whole status file) per package.
+
+    Returns:
+        Dict mapping each package name to whether it is installed
+    """
+    # dpkg-query exits non-zero if any package is unknown; the status of
+    # the known ones is still printed
+    result = run_command(
+        ["dpkg-query", "-W", "-f=${Package} ${Status}\\n"] + list(packages),
+        check=False
+    )
+
+    installed = dict.fromkeys(packages, False)
+    for line in (result.stdout or "").splitlines():
+        package, _, status = line.partition(" ")
+        if package in installed:
+            installed[package] = "install ok installed" in status
+    return installed
 
 def install_system_packages():
     """Install required system packages"""
@@ -123,9 +342,12 @@ def install_system_packages():
     ]
 
     # Check which packages need to be installed
+    installed = get_installed_packages(
+        [package for package, _ in packages] + ["eatmydata"]
+    )
     to_install = []
     for package, description in packages:
-        if check_package_installed(package):
+        if installed[package]:
             print_status(f"{package:20s} already installed")
         else:
             print_warning(f"{package:20s} not installed - will install")
@@ -135,17 +357,32 @@ def install_system_packages():
         print_status("All required packages already installed")
         return True
 
-    # Update package list
-    print_info("\nUpdating package list...")
-    run_command(["sudo", "apt", "update"])
-    print_status("Package list updated")
-
-    # Install missing packages
     print_info(f"\nInstalling {len(to_install)} packages...")
     for pkg in to_install:
         print_info(f"  - {pkg}")
 
-    result = run_command(["sudo", "apt", "install", "-y"] + to_install)
+    # Update and install run in one root shell so the dpkg lock is taken
+    # once; apt waits for the lock (e.g. held by unattended-upgrades)
+    # instead of failing, uses no pty for progress output and pulls in
+    # only the declared dependencies
+    apt_get = "apt-get -o Dpkg::Use-Pty=0 -o DPkg::Lock::Timeout=300"
+    steps = [f"{apt_get} update"]
+
+    # eatmydata turns dpkg's per-file fsync() into a no-op, which takes
+    # most of the install time on SD card / eMMC storage; if it cannot be
+    # installed, $(command -v eatmydata) expands to nothing
+    if not installed["eatmydata"]:
+        steps.append(f"{{ {apt_get} install -y eatmydata || true; }}")
+    steps.append(
+        f"$(command -v eatmydata) {apt_get} install -y --no-install-recommends "
+        + " ".join(shlex.quote(pkg) for pkg in to_install)
+    )
+
+    # sudo resets the environment, so the frontend is set through env
+    result = run_command(
+        sudo_prefix() + ["env", "DEBIAN_FRONTEND=noninteractive",
+                         "sh", "-c", " && ".join(steps)]
+    )
 
     if result.returncode == 0:
         print_status("System packages installed successfully")
@@ -154,18 +391,13 @@ def install_system_packages():
         print_error("Failed to install system packages")
         return False
 
-def check_venv():
+def check_venv(create=True):
     """Check if virtual environment exists and is activated"""
     print_info("\n" + "="*60)
     print_info("STEP 2: Checking Virtual Environment")
     print_info("="*60)
 
-    # Check if we're in a venv
-    in_venv = hasattr(sys, 'real_prefix') or (
-        hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix
-    )
-
-    if in_venv:
+    if IN_VENV:
         print_status("Virtual environment is active")
         print_info(f"Python: {sys.executable}")
         return True
@@ -182,9 +414,12 @@ def check_venv():
             return False
         else:
             print_warning("No virtual environment found")
-            response = input("Create virtual environment now? (Y/n): ").strip().lower()
 
-            if response in ['', 'y', 'yes']:
+            if load_state().get("system_python") == sys.executable:
+                print_info("Installing to system Python as chosen in an earlier run")
+                return True
+
+            if create and confirm("Create virtual environment now? (Y/n): "):
                 print_info("Creating virtual environment...")
                 run_command(["python3", "-m", "venv", "venv"])
                 print_status("Virtual environment created")
@@ -194,27 +429,168 @@ def check_venv():
                 return False
             else:
                 print_warning("Skipping virtual environment - will install to system Python")
+                save_state("system_python", sys.executable)
                 return True
 
-def get_pip_path():
-    """Get pip path (venv or system)"""
-    # Check if in venv
-    in_venv = hasattr(sys, 'real_prefix') or (
-        hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix
-    )
-
-    if in_venv:
-        return str(Path(sys.executable).parent / "pip")
-    else:
-        return "pip3"
+# Distribution names of packages whose import name differs
+DIST_NAMES = {
+    'yaml': 'PyYAML',
+    'pyyaml': 'PyYAML',
+    'pyaudio': 'PyAudio'
+}
 
 def check_python_package(package):
-    """Check if a Python package is installed"""
+    """Get the installed version of a Python package
+
+    Reads the package metadata instead of importing it, which for torch or
+    transformers takes seconds on RISC-V.
+
+    Returns:
+        Version string, or None if the package is not installed
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
-        __import__(package)
+        return version(DIST_NAMES.get(package, package))
+    except PackageNotFoundError:
+        return None
+
+def build_jobs():
+    """Number of parallel compile jobs for source builds
+
+    Every core this process may run on, but at most 2 when less than 4GB
+    of memory is available: the link steps of NumPy/SciPy can each take
+    over a GB and run out of memory otherwise.
+    """
+    jobs = len(os.sched_getaffinity(0))
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    if int(line.split()[1]) < 4 * 1024 * 1024:  # kB
+                        jobs = min(jobs, 2)
+                    break
+    except (OSError, ValueError):
+        pass
+    return jobs
+
+def build_env():
+    """Environment for source builds, with the job count from build_jobs()"""
+    jobs = str(build_jobs())
+    return {
+        **os.environ,
+        "MAKEFLAGS": f"-j{jobs}",
+        "MAX_JOBS": jobs,
+        "CMAKE_BUILD_PARALLEL_LEVEL": jobs,
+        "NPY_NUM_BUILD_JOBS": jobs
+    }
+
+def probe_package(package):
+    """Check that a package is importable and get its version, without importing it
+
+    Returns:
+        Version string ("unknown" without package metadata), or None if the
+        package can't be imported
+    """
+    if importlib.util.find_spec(package) is None:
+        return None
+    return check_python_package(package) or "unknown"
+
+def install_from_wheel_cache(package, timeout):
+    """Build (or reuse) a wheel in WHEEL_CACHE, then install it offline
+
+    Returns:
+        Result of the install command
+    """
+    WHEEL_CACHE.mkdir(parents=True, exist_ok=True)
+
+    # Wheels already in the cache satisfy the requirement without a rebuild
+    run_command(
+        PIP_COMMAND + [
+            "wheel", "--prefer-binary",
+            "--wheel-dir", str(WHEEL_CACHE), "--find-links", str(WHEEL_CACHE),
+            package
+        ] + EXTRA_INDEX + PIP_VERBOSE,
+        timeout=timeout,
+        stream=True,
+        env=build_env()
+    )
+    return run_command(
+        PIP_COMMAND + ["install", "--no-index", "--find-links", str(WHEEL_CACHE), package],
+        timeout=timeout,
+        stream=True
+    )
+
+def wheel_available(package):
+    """Check whether pip would install a pre-built wheel of a package
+
+    Tries a quick binary-only download (the local wheel cache counts), so
+    the user knows before a long install whether it means a source build.
+    """
+    print_info(f"Checking for a pre-built {package} wheel...")
+    with tempfile.TemporaryDirectory() as probe_dir:
+        try:
+            result = run_command(
+                PIP_COMMAND + [
+                    "download", "--no-deps", "--only-binary=:all:",
+                    "--find-links", str(WHEEL_CACHE), "--dest", probe_dir,
+                    package
+                ] + EXTRA_INDEX,
+                check=False,
+                timeout=120
+            )
+        except subprocess.TimeoutExpired:
+            return False
+    return result.returncode == 0
+
+def install_requirements_at_once():
+    """Install NumPy and the core packages with one pip resolver pass
+
+    Installing them in separate steps makes pip resolve (and possibly
+    rebuild) NumPy again for each step. If the combined install fails, the
+    staged steps that follow install whatever is still missing one tier at
+    a time, which also makes the failure easier to pin down.
+
+    Returns:
+        True if all packages are installed, False otherwise
+    """
+    missing = [
+        package for package in ["numpy"] + list(CORE_PACKAGES)
+        if not check_python_package(package)
+    ]
+    if not missing:
         return True
-    except ImportError:
-        return False
+
+    print_info("\n" + "="*60)
+    print_info("Installing NumPy and core packages together")
+    print_info("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        requirements_file = Path(tmp_dir) / "requirements.txt"
+        requirements_file.write_text("\n".join(missing) + "\n")
+
+        try:
+            result = run_command(
+                PIP_COMMAND + [
+                    "install", "--prefer-binary",
+                    "--find-links", str(WHEEL_CACHE),
+                    "-r", str(requirements_file)
+                ] + EXTRA_INDEX,
+                check=False,
+                timeout=1800 + 600 * len(missing),
+                stream=True,
+                env=build_env()
+            )
+        except subprocess.TimeoutExpired:
+            result = None
+
+        if result is None or result.returncode != 0:
+            print_warning("Combined install failed - installing step by step instead")
+            return False
+
+    for package in missing:
+        print_status(f"{package:20s} installed ({check_python_package(package)})")
+    return True
 
 def install_numpy():
     """Install NumPy"""
@@ -222,22 +598,23 @@ def install_numpy():
     print_info("STEP 3: Installing NumPy")
     print_info("="*60)
 
-    if check_python_package("numpy"):
-        import numpy
-        print_status(f"NumPy already installed: {numpy.__version__}")
+    version = check_python_package("numpy")
+    if version:
+        print_status(f"NumPy already installed: {version}")
         return True
 
-    print_info("Installing NumPy (may take 5-10 minutes on RISC-V)...")
-    print_info("This is being compiled from source - please be patient")
-
-    pip_path = get_pip_path()
+    if wheel_available("numpy"):
+        print_info("A pre-built wheel is available - install will be fast")
+        print_info("Installing NumPy...")
+    else:
+        print_info("Installing NumPy (may take 5-10 minutes on RISC-V)...")
+        print_info("This is being compiled from source - please be patient")
 
     try:
-        result = run_command([pip_path, "install", "numpy"], timeout=1800)  # 30 min timeout
+        result = install_from_wheel_cache("numpy", timeout=1800)  # 30 min timeout
 
         if result.returncode == 0:
-            import numpy
-            print_status(f"NumPy installed successfully: {numpy.__version__}")
+            print_status(f"NumPy installed successfully: {check_python_package('numpy')}")
             return True
         else:
             print_error("NumPy installation failed")
@@ -247,46 +624,43 @@ def install_numpy():
         print_error("NumPy installation timed out (>30 minutes)")
         return False
 
-def install_scipy():
+def install_scipy(skip=False):
     """Install SciPy"""
     print_info("\n" + "="*60)
     print_info("STEP 4: Installing SciPy")
     print_info("="*60)
 
-    if check_python_package("scipy"):
-        import scipy
-        print_status(f"SciPy already installed: {scipy.__version__}")
+    version = check_python_package("scipy")
+    if version:
+        print_status(f"SciPy already installed: {version}")
         return True
 
-    print_warning("SciPy installation on RISC-V takes 10-30 minutes")
-    print_info("The build is compiling Fortran code - this is normal")
-
-    response = input("\nProceed with SciPy installation? (Y/n/skip): ").strip().lower()
+    has_wheel = wheel_available("scipy")
+    if has_wheel:
+        print_info("A pre-built wheel is available - install will be fast")
+    else:
+        print_warning("No wheel for this platform - source build required, est. 10-30 minutes")
+        print_info("The build is compiling Fortran code - this is normal")
 
-    if response in ['n', 'no']:
+    if skip or not confirm("\nProceed with SciPy installation? (Y/n/skip): "):
         print_warning("Skipping SciPy installation")
         print_info("Note: Core functionality works without SciPy")
         return True
 
-    if response == 'skip':
-        print_info("Skipping SciPy - will continue without it")
-        return True
-
     print_info("Installing SciPy...")
-    print_info("⏰ This will take 10-30 minutes - grab a coffee! ☕")
+    if not has_wheel:
+        print_info("⏰ This will take 10-30 minutes - grab a coffee! ☕")
 
-    pip_path = get_pip_path()
     start_time = time.time()
 
     try:
-        result = run_command([pip_path, "install", "scipy", "--verbose"], timeout=3600)  # 60 min timeout
+        result = install_from_wheel_cache("scipy", timeout=3600)  # 60 min timeout
 
         elapsed = time.time() - start_time
         minutes = int(elapsed / 60)
 
         if result.returncode == 0:
-            import scipy
-            print_status(f"SciPy installed successfully: {scipy.__version__}")
+            print_status(f"SciPy installed successfully: {check_python_package('scipy')}")
             print_info(f"Installation took {minutes} minutes")
             return True
         else:
@@ -300,26 +674,83 @@ def install_scipy():
         print_warning("Continuing without SciPy")
         return True  # Don't fail completely
 
+def find_missing_packages(packages):
+    """Print the installed packages of a tier and return the missing ones"""
+    missing = []
+    for package, description in packages.items():
+        version = check_python_package(package)
+        if version:
+            print_status(f"{package:20s} already installed ({version})")
+        else:
+            print_info(f"Will install {package} ({description})")
+            missing.append(package)
+    return missing
+
+def download_packages(tiers):
+    """Download the packages of all tiers into WHEEL_CACHE concurrently
+
+    Downloads are network-bound and independent, so one pip download per
+    tier runs at the same time. Installing stays sequential: concurrent pip
+    installs would race on shared dependencies in site-packages. Failures
+    are ignored, the install then fetches what is missing itself.
+    """
+    tiers = [missing for missing in tiers if missing]
+    if not tiers:
+        return
+
+    WHEEL_CACHE.mkdir(parents=True, exist_ok=True)
+    print_info("\nDownloading packages...")
+
+    def download(missing):
+        return run_command(
+            PIP_COMMAND + [
+                "download", "--prefer-binary",
+                "--dest", str(WHEEL_CACHE), "--find-links", str(WHEEL_CACHE)
+            ] + EXTRA_INDEX + missing,
+            check=False,
+            timeout=600 * len(missing)
+        )
+
+    with ThreadPoolExecutor(max_workers=len(tiers)) as executor:
+        list(executor.map(download, tiers))
+
+def install_package_batch(missing, retry_individually=False):
+    """Install the missing packages of a tier with one pip invocation
+
+    One pip run resolves the dependencies of the whole tier together,
+    instead of paying interpreter startup and a resolver pass per package.
+    pip installs nothing if any package of the batch fails, so with
+    retry_individually the missing packages are then retried one by one
+    to isolate the failure.
+
+    Returns:
+        Dict mapping each missing package to whether it is now installed
+    """
+    if not missing:
+        return {}
+
+    install_cmd = PIP_COMMAND + [
+        "install", "--prefer-binary",
+        "--find-links", str(WHEEL_CACHE),
+        "--upgrade-strategy", "only-if-needed"
+    ] + EXTRA_INDEX
+
+    print_info(f"Installing {len(missing)} packages...")
+    result = run_command(install_cmd + missing, check=False, timeout=600 * len(missing))
+
+    if result.returncode != 0 and retry_individually:
+        print_warning("Batch install failed, retrying packages individually...")
+        for package in missing:
+            run_command(install_cmd + [package], check=False, timeout=600)
+
+    return {package: check_python_package(package) is not None for package in missing}
+
 def install_other_packages():
     """Install other critical packages"""
     print_info("\n" + "="*60)
     print_info("STEP 5: Installing Other Dependencies")
     print_info("="*60)
 
-    pip_path = get_pip_path()
-
-    # Core packages that should work on RISC-V
-    core_packages = {
-        'transformers': 'Hugging Face Transformers',
-        'fastapi': 'FastAPI web framework',
-        'uvicorn': 'ASGI server',
-        'jinja2': 'Template engine',
-        'click': 'CLI framework',
-        'rich': 'Terminal formatting',
-        'pyyaml': 'YAML parser',
-        'requests': 'HTTP library'
-    }
-
     # Audio packages
     audio_packages = {
         'pyaudio': 'Audio I/O',
@@ -335,58 +766,48 @@ def install_other_packages():
         'protobuf': 'Protocol Buffers'
     }
 
+    # Check which packages are missing in each tier
+    print_info("\nChecking core packages...")
+    missing_core = find_missing_packages(CORE_PACKAGES)
+    print_info("\nChecking audio packages...")
+    missing_audio = find_missing_packages(audio_packages)
+    print_info("\nChecking optional packages...")
+    missing_optional = find_missing_packages(optional_packages)
+
+    download_packages([missing_core, missing_audio, missing_optional])
+
     # Install core packages
     print_info("\nInstalling core packages...")
-    for package, description in core_packages.items():
-        if check_python_package(package):
-            mod = __import__(package)
-            version = getattr(mod, '__version__', 'unknown')
-            print_status(f"{package:20s} already installed ({version})")
+    results = install_package_batch(missing_core)
+    for package, installed in results.items():
+        if installed:
+            print_status(f"{package:20s} installed")
         else:
-            print_info(f"Installing {package} ({description})...")
-            result = run_command([pip_path, "install", package], check=False, timeout=600)
-
-            if result.returncode == 0:
-                print_status(f"{package:20s} installed")
-            else:
-                print_error(f"{package:20s} installation FAILED")
-                return False
+            print_error(f"{package:20s} installation FAILED")
+    if not all(results.values()):
+        return False
 
     # Install audio packages
     print_info("\nInstalling audio packages...")
-    for package, description in audio_packages.items():
-        if check_python_package(package):
-            mod = __import__(package)
-            version = getattr(mod, '__version__', 'unknown')
-            print_status(f"{package:20s} already installed ({version})")
+    results = install_package_batch(missing_audio, retry_individually=True)
+    for package, installed in results.items():
+        if installed:
+            print_status(f"{package:20s} installed")
         else:
-            print_info(f"Installing {package} ({description})...")
-            result = run_command([pip_path, "install", package], check=False, timeout=600)
-
-            if result.returncode == 0:
-                print_status(f"{package:20s} installed")
-            else:
-                print_warning(f"{package:20s} installation failed (may work without it)")
+            print_warning(f"{package:20s} installation failed (may work without it)")
 
     # Install optional packages (don't fail if they don't work)
     print_info("\nInstalling optional packages (RISC-V may not have pre-built wheels)...")
-    for package, description in optional_packages.items():
-        if check_python_package(package):
-            mod = __import__(package)
-            version = getattr(mod, '__version__', 'unknown')
-            print_status(f"{package:20s} already installed ({version})")
+    results = install_package_batch(missing_optional, retry_individually=True)
+    for package, installed in results.items():
+        if installed:
+            print_status(f"{package:20s} installed")
         else:
-            print_info(f"Trying to install {package} ({description})...")
-            result = run_command([pip_path, "install", package], check=False, timeout=600)
-
-            if result.returncode == 0:
-                print_status(f"{package:20s} installed")
-            else:
-                print_warning(f"{package:20s} not available for RISC-V (will use alternatives)")
+            print_warning(f"{package:20s} not available for RISC-V (will use alternatives)")
 
-                if package == 'onnxruntime':
-                    print_info("  → ONNX Runtime requires building from source on RISC-V")
-                    print_info("  → Application will work with PyTorch/Transformers instead")
+            if package == 'onnxruntime':
+                print_info("  → ONNX Runtime requires building from source on RISC-V")
+                print_info("  → Application will work with PyTorch/Transformers instead")
 
     return True
 
@@ -405,36 +826,39 @@ def verify_installation():
     # Nice to have
     optional_packages = ['accelerate', 'sentencepiece', 'pyaudio']
 
-    print_info("\nCore packages (required):")
-    all_critical_ok = True
-    for package in critical_packages:
-        if check_python_package(package):
-            mod = __import__(package)
-            version = getattr(mod, '__version__', 'unknown')
-            print_status(f"  ✓ {package:20s} {version}")
-        else:
-            print_error(f"  ✗ {package:20s} NOT INSTALLED")
-            all_critical_ok = False
-
-    print_info("\nImportant packages (recommended):")
-    important_count = 0
-    for package in important_packages:
-        if check_python_package(package):
-            mod = __import__(package)
-            version = getattr(mod, '__version__', 'unknown')
-            print_status(f"  ✓ {package:20s} {version}")
-            important_count += 1
-        else:
-            print_warning(f"  - {package:20s} not installed")
-
-    print_info("\nOptional packages:")
-    for package in optional_packages:
-        if check_python_package(package):
-            mod = __import__(package)
-            version = getattr(mod, '__version__', 'unknown')
-            print_status(f"  ✓ {package:20s} {version}")
-        else:
-            print_warning(f"  - {package:20s} not installed")
+    tiers = [
+        ("Core packages (required):", critical_packages,
+         lambda package: print_error(f"  ✗ {package:20s} NOT INSTALLED")),
+        ("Important packages (recommended):", important_packages,
+         lambda package: print_warning(f"  - {package:20s} not installed")),
+        ("Optional packages:", optional_packages,
+         lambda package: print_warning(f"  - {package:20s} not installed"))
+    ]
+
+    found = {}
+    for title, packages, print_missing in tiers:
+        print_info(f"\n{title}")
+        for package in packages:
+            found[package] = probe_package(package)
+            if found[package]:
+                print_status(f"  ✓ {package:20s} {found[package]}")
+            else:
+                print_missing(package)
+
+    PROBE_RESULTS.update(found)
+
+    all_critical_ok = all(found[package] for package in critical_packages)
+    important_count = sum(1 for package in important_packages if found[package])
+
+    # One real import of the critical packages, to catch broken installs
+    if all_critical_ok:
+        try:
+            import numpy  # noqa: F401
+            import transformers  # noqa: F401
+            import fastapi  # noqa: F401
+        except Exception as e:
+            print_error(f"\n❌ Critical packages are installed but fail to import: {e}")
+            return False
 
     # Show recommendations
     if not all_critical_ok:
@@ -459,9 +883,10 @@ def print_summary():
     print_status("\n✅ RISC-V installation completed!")
 
     # Check what was installed
-    has_onnxruntime = check_python_package('onnxruntime')
-    has_torch = check_python_package('torch')
-    has_scipy = check_python_package('scipy')
+    # Versions found during verification
+    has_onnxruntime = PROBE_RESULTS.get('onnxruntime')
+    has_torch = PROBE_RESULTS.get('torch')
+    has_scipy = PROBE_RESULTS.get('scipy')
 
     print_info("\n📦 Installed Inference Engines:")
     if has_scipy:
@@ -485,8 +910,7 @@ def print_summary():
     print_info("     python3 scripts/install_sbc.py --models-only")
     print_info("")
     print_info("  2. Test the installation:")
-    print_info("     python3 -c 'import numpy, transformers, fastapi'")
-    print_info("     python3 -c 'print(\"Core packages OK!\")'")
+    print_info("     ✅ Already verified above.")
     print_info("")
     print_info("  3. Run the web app:")
     print_info("     cd ~/Meetingassistant")
@@ -506,11 +930,48 @@ def print_summary():
 
 def main():
     """Main function"""
+    global ASSUME_YES, IGNORE_STATE
+
+    parser = argparse.ArgumentParser(
+        description="Fix SciPy/gfortran installation issues on RISC-V"
+    )
+    parser.add_argument(
+        '--yes', '-y',
+        action='store_true',
+        help='Answer all prompts with their default (also: MA_ASSUME_YES=1)'
+    )
+    parser.add_argument(
+        '--no-scipy',
+        action='store_true',
+        help='Skip the SciPy installation'
+    )
+    parser.add_argument(
+        '--skip-venv-create',
+        action='store_true',
+        help="Don't create a virtual environment, install to the current Python"
+    )
+    parser.add_argument(
+        '--assume-riscv',
+        action='store_true',
+        help='Continue without asking on non-RISC-V architectures'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Ignore answers saved by earlier runs'
+    )
+    args = parser.parse_args()
+
+    if args.yes:
+        ASSUME_YES = True
+    if args.force:
+        IGNORE_STATE = True
+
     print_banner()
 
     try:
         # Check architecture
-        if not check_architecture():
+        if not check_architecture(assume_riscv=args.assume_riscv):
             print_error("Aborting installation")
             sys.exit(1)
 
@@ -525,16 +986,19 @@ def main():
             sys.exit(1)
 
         # Check virtual environment
-        if not check_venv():
+        if not check_venv(create=not args.skip_venv_create):
             print_info("\nPlease activate virtual environment and re-run this script")
             sys.exit(0)
 
-        # Install Python packages
+        # Install Python packages; NumPy and the core packages are resolved
+        # together first, the staged steps then only handle what is missing
+        install_requirements_at_once()
+
         if not install_numpy():
             print_error("NumPy installation failed - cannot continue")
             sys.exit(1)
 
-        install_scipy()  # Optional, won't fail if it doesn't work
+        install_scipy(skip=args.no_scipy)  # Optional, won't fail if it doesn't work
 
         install_other_packages()
 
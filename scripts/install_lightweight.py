@@ -10,6 +10,8 @@ import subprocess
 import platform
 import shutil
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -21,29 +23,111 @@ class Colors:
     BLUE = '\033[0;34m'
     NC = '\033[0m'  # No Color
 
+# No escape codes when output is piped/logged, or when NO_COLOR is set
+# (https://no-color.org)
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    Colors.RED = Colors.GREEN = Colors.YELLOW = Colors.BLUE = Colors.NC = ''
+
+# Persistent wheel cache so re-runs reuse already built/downloaded wheels
+PIP_CACHE_DIR = Path.home() / ".cache" / "meetingassistant-pip"
+WHEELS_DIR = Path.home() / ".cache" / "meetingassistant-wheels"
+
+# Launcher scripts written by create_scripts(), keyed by file name
+CLI_LAUNCHER = '''#!/usr/bin/env python3
+import os
+import sys
+from pathlib import Path
+
+# Change to script directory
+script_dir = Path(__file__).parent.absolute()
+os.chdir(script_dir)
+
+print("Meeting Assistant - Minimal Mode")
+print("Note: This installation requires API keys for STT and summarization")
+
+# Activate virtual environment
+venv_python = script_dir / "venv" / "bin" / "python3"
+if not venv_python.exists():
+    print("Error: Virtual environment not found. Please run install_lightweight.py first.")
+    sys.exit(1)
+
+# Run CLI with arguments, replacing this launcher process
+sys.stdout.flush()
+os.execv(str(venv_python), [str(venv_python), "cli.py"] + sys.argv[1:])
+'''
+
+WEB_LAUNCHER = '''#!/usr/bin/env python3
+import os
+import sys
+from pathlib import Path
+
+# Change to script directory
+script_dir = Path(__file__).parent.absolute()
+os.chdir(script_dir)
+
+print("Meeting Assistant Web - Minimal Mode")
+print("Configure API keys in config.yaml before use")
+
+# Activate virtual environment
+venv_python = script_dir / "venv" / "bin" / "python3"
+if not venv_python.exists():
+    print("Error: Virtual environment not found. Please run install_lightweight.py first.")
+    sys.exit(1)
+
+# Run web app, replacing this launcher process
+sys.stdout.flush()
+os.execv(str(venv_python), [str(venv_python), "web_app.py"])
+'''
+
+LAUNCHER_SCRIPTS = {
+    "run_cli_minimal.py": CLI_LAUNCHER,
+    "run_web_minimal.py": WEB_LAUNCHER,
+}
+
+# Message prefixes, built once rather than formatted on every call
+INFO_PREFIX = f"{Colors.GREEN}[INFO]{Colors.NC} "
+WARNING_PREFIX = f"{Colors.YELLOW}[WARNING]{Colors.NC} "
+ERROR_PREFIX = f"{Colors.RED}[ERROR]{Colors.NC} "
+HEADER_PREFIX = f"{Colors.BLUE}=== "
+HEADER_SUFFIX = f" ==={Colors.NC}\n"
+
+# Each message goes out as a single write so lines from the download
+# threads can't interleave mid-line
+
 def print_status(message: str):
-    print(f"{Colors.GREEN}[INFO]{Colors.NC} {message}")
+    sys.stdout.write(INFO_PREFIX + message + "\n")
 
 def print_warning(message: str):
-    print(f"{Colors.YELLOW}[WARNING]{Colors.NC} {message}")
+    sys.stdout.write(WARNING_PREFIX + message + "\n")
 
 def print_error(message: str):
-    print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
+    sys.stdout.write(ERROR_PREFIX + message + "\n")
 
 def print_header(message: str):
-    print(f"{Colors.BLUE}=== {message} ==={Colors.NC}")
+    sys.stdout.write(HEADER_PREFIX + message + HEADER_SUFFIX)
+
+def run_command(cmd: List[str], check: bool = True, stream: bool = False) -> subprocess.CompletedProcess:
+    """Run a command and return the result
 
-def run_command(cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a command and return the result"""
+    With stream=True the command's output goes straight to the terminal
+    instead of being captured, so long apt/pip runs show their progress
+    (and their output isn't held in memory).
+    """
     try:
+        if stream:
+            # Make sure our own messages appear before the command's output
+            sys.stdout.flush()
+            return subprocess.run(cmd, check=check)
         return subprocess.run(cmd, check=check, capture_output=True, text=True)
     except subprocess.CalledProcessError as e:
         if check:
             print_error(f"Command failed: {' '.join(cmd)}")
-            print_error(f"Error: {e.stderr}")
+            if e.stderr:
+                print_error(f"Error: {e.stderr}")
             raise
         return e
 
+@functools.lru_cache(maxsize=None)
 def command_exists(cmd: str) -> bool:
     """Check if a command exists in PATH"""
     return shutil.which(cmd) is not None
@@ -61,19 +145,14 @@ def check_dependencies() -> bool:
         else:
             missing_deps.append(cmd)
 
-    # Check Python version
+    # Check Python version (this script runs under python3 itself, so no
+    # need to spawn it just to ask for its version)
     if command_exists("python3"):
-        result = run_command(["python3", "--version"])
-        python_version = result.stdout.split()[1]
+        python_version = "{}.{}.{}".format(*sys.version_info[:3])
         print_status(f"Python version: {python_version}")
 
         # Check if Python version is >= 3.8
-        version_check = run_command([
-            "python3", "-c",
-            "import sys; exit(0 if sys.version_info >= (3, 8) else 1)"
-        ], check=False)
-
-        if version_check.returncode == 0:
+        if sys.version_info >= (3, 8):
             print_status("Python version is compatible")
         else:
             print_error("Python 3.8 or higher is required")
@@ -96,8 +175,8 @@ def install_minimal_packages() -> bool:
     ]
 
     print_status(f"Installing packages: {', '.join(packages)}")
-    run_command(["sudo", "apt", "update"])
-    run_command(["sudo", "apt", "install", "-y"] + packages)
+    run_command(["sudo", "apt", "update"], stream=True)
+    run_command(["sudo", "apt", "install", "-y"] + packages, stream=True)
 
     return True
 
@@ -115,7 +194,8 @@ def setup_python_env() -> bool:
     # Activate virtual environment and upgrade pip
     pip_path = venv_path / "bin" / "pip"
     print_status("Upgrading pip")
-    run_command([str(pip_path), "install", "--upgrade", "pip"])
+    # pip 23.1+ has the faster resolver and better wheel caching
+    run_command([str(pip_path), "install", "--upgrade", "pip>=23.1"], stream=True)
 
     return True
 
@@ -125,20 +205,51 @@ def install_minimal_deps() -> bool:
 
     pip_path = Path("venv/bin/pip")
 
-    print_status("Installing core dependencies")
-    run_command([str(pip_path), "install", "numpy", "pyyaml", "click", "rich"])
-
-    print_status("Installing audio dependencies")
-    run_command([str(pip_path), "install", "pyaudio", "pydub"])
-
-    print_status("Installing web framework")
-    run_command([str(pip_path), "install", "fastapi", "uvicorn", "jinja2", "python-multipart", "aiofiles"])
-
-    print_status("Installing basic STT")
-    run_command([str(pip_path), "install", "SpeechRecognition"])
-
-    print_status("Installing utilities")
-    run_command([str(pip_path), "install", "python-dotenv", "requests", "sqlalchemy"])
+    dependency_groups = {
+        "core dependencies": ["numpy", "pyyaml", "click", "rich"],
+        "audio dependencies": ["pyaudio", "pydub"],
+        "web framework": ["fastapi", "uvicorn", "jinja2", "python-multipart", "aiofiles"],
+        "basic STT": ["SpeechRecognition"],
+        "utilities": ["python-dotenv", "requests", "sqlalchemy"],
+    }
+
+    # Groups are only fetched separately, and concurrently (each pip
+    # process mostly waits on the network); everything is then installed
+    # by one pip invocation from the local wheel directory, so pip starts
+    # and resolves dependencies only once. `pip wheel` rather than
+    # `pip download`: sdist-only packages such as pyaudio are built into
+    # wheels here, so the offline install needs no build dependencies
+    def download(group: str) -> bool:
+        print_status(f"Downloading {group}")
+        result = run_command([
+            str(pip_path), "wheel", "--prefer-binary",
+            "--cache-dir", str(PIP_CACHE_DIR),
+            "--wheel-dir", str(WHEELS_DIR), "--find-links", str(WHEELS_DIR)
+        ] + dependency_groups[group], check=False)
+        return result.returncode == 0
+
+    WHEELS_DIR.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        downloaded = all(executor.map(download, dependency_groups))
+
+    packages = [pkg for group_packages in dependency_groups.values() for pkg in group_packages]
+
+    # Prefer prebuilt wheels so numpy/pyaudio aren't compiled from source
+    # when a slightly older binary release is available
+    print_status("Installing dependencies")
+    installed = downloaded and run_command([
+        str(pip_path), "install", "--prefer-binary",
+        "--no-index", "--find-links", str(WHEELS_DIR)
+    ] + packages, check=False, stream=True).returncode == 0
+
+    # A package that failed to build a wheel above is retried with a normal
+    # install, which reports the actual build error
+    if not installed:
+        print_warning("Offline install from downloaded wheels failed, installing from PyPI")
+        run_command([
+            str(pip_path), "install", "--prefer-binary",
+            "--cache-dir", str(PIP_CACHE_DIR)
+        ] + packages, stream=True)
 
     return True
 
@@ -146,61 +257,75 @@ def create_minimal_config():
     """Create minimal configuration"""
     print_header("Creating Minimal Configuration")
 
-    config_content = '''# Meeting Assistant Minimal Configuration
-app:
-  name: "Meeting Assistant"
-  version: "1.0.0"
-  debug: false
-
-# Server configuration
-server:
-  host: "localhost"
-  port: 8000
-  reload: true
-
-# Audio settings
-audio:
-  sample_rate: 16000
-  channels: 1
-  chunk_size: 1024
-  format: "wav"
-  input_device: null
-
-# Speech-to-Text (minimal)
-stt:
-  default_engine: "google"
-  engines:
-    google:
-      api_key: null
-      language: "en-US"
-
-# Summarization (API-based only)
-summarization:
-  default_engine: "openai"
-  engines:
-    openai:
-      api_key: null
-      model: "gpt-3.5-turbo"
-      max_tokens: 1000
-
-# Storage settings
-storage:
-  data_dir: "./data"
-  meetings_dir: "./data/meetings"
-  models_dir: "./models"
-  database_url: "sqlite:///./data/meetings.db"
-
-# Processing settings
-processing:
-  real_time_stt: false
-  auto_summarize: false
-  speaker_detection: false
-  chunk_duration: 30
-  max_meeting_duration: 14400
-'''
+    config = {
+        'app': {
+            'name': "Meeting Assistant",
+            'version': "1.0.0",
+            'debug': False,
+        },
+        # Server configuration
+        'server': {
+            'host': "localhost",
+            'port': 8000,
+            'reload': True,
+        },
+        # Audio settings
+        'audio': {
+            'sample_rate': 16000,
+            'channels': 1,
+            'chunk_size': 1024,
+            'format': "wav",
+            'input_device': None,
+        },
+        # Speech-to-Text (minimal)
+        'stt': {
+            'default_engine': "google",
+            'engines': {
+                'google': {
+                    'api_key': None,
+                    'language': "en-US",
+                },
+            },
+        },
+        # Summarization (API-based only)
+        'summarization': {
+            'default_engine': "openai",
+            'engines': {
+                'openai': {
+                    'api_key': None,
+                    'model': "gpt-3.5-turbo",
+                    'max_tokens': 1000,
+                },
+            },
+        },
+        # Storage settings
+        'storage': {
+            'data_dir': "./data",
+            'meetings_dir': "./data/meetings",
+            'models_dir': "./models",
+            'database_url': "sqlite:///./data/meetings.db",
+        },
+        # Processing settings
+        'processing': {
+            'real_time_stt': False,
+            'auto_summarize': False,
+            'speaker_detection': False,
+            'chunk_duration': 30,
+            'max_meeting_duration': 14400,
+        },
+    }
+
+    # This runs under the system Python, which may not have PyYAML yet;
+    # JSON is valid YAML, so fall back to that
+    try:
+        import yaml
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        config_text = yaml.dump(config, Dumper=dumper, sort_keys=False)
+    except ImportError:
+        import json
+        config_text = json.dumps(config, indent=2) + "\n"
 
-    with open("config.yaml", 'w') as f:
-        f.write(config_content)
+    Path("config.yaml").write_text("# Meeting Assistant Minimal Configuration\n" + config_text)
 
     print_status("Minimal configuration created")
 
@@ -208,59 +333,12 @@ def create_scripts():
     """Create startup scripts"""
     print_header("Creating Startup Scripts")
 
-    # Create minimal CLI launcher script
-    with open("run_cli_minimal.py", 'w') as f:
-        f.write('''#!/usr/bin/env python3
-import os
-import sys
-import subprocess
-from pathlib import Path
-
-# Change to script directory
-script_dir = Path(__file__).parent.absolute()
-os.chdir(script_dir)
-
-print("Meeting Assistant - Minimal Mode")
-print("Note: This installation requires API keys for STT and summarization")
-
-# Activate virtual environment
-venv_python = script_dir / "venv" / "bin" / "python3"
-if not venv_python.exists():
-    print("Error: Virtual environment not found. Please run install_lightweight.py first.")
-    sys.exit(1)
-
-# Run CLI with arguments
-cmd = [str(venv_python), "cli.py"] + sys.argv[1:]
-subprocess.run(cmd)
-''')
-
-    # Create minimal web launcher script
-    with open("run_web_minimal.py", 'w') as f:
-        f.write('''#!/usr/bin/env python3
-import os
-import sys
-import subprocess
-from pathlib import Path
-
-# Change to script directory
-script_dir = Path(__file__).parent.absolute()
-os.chdir(script_dir)
-
-print("Meeting Assistant Web - Minimal Mode")
-print("Configure API keys in config.yaml before use")
-
-# Activate virtual environment
-venv_python = script_dir / "venv" / "bin" / "python3"
-if not venv_python.exists():
-    print("Error: Virtual environment not found. Please run install_lightweight.py first.")
-    sys.exit(1)
-
-# Run web app
-subprocess.run([str(venv_python), "web_app.py"])
-''')
+    for script, content in LAUNCHER_SCRIPTS.items():
+        with open(script, 'w') as f:
+            f.write(content)
 
     # Make scripts executable
-    for script in ["run_cli_minimal.py", "run_web_minimal.py"]:
+    for script in LAUNCHER_SCRIPTS:
         os.chmod(script, 0o755)
 
     print_status("Created minimal launcher scripts")
@@ -8,13 +8,52 @@ import os
 import sys
 import subprocess
 import platform
+import re
 import shutil
+import tempfile
+import urllib.error
 import urllib.request
 import zipfile
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+# System packages requested by the installer steps; they are installed
+# together by flush_apt(), so apt's index update and dependency solver run
+# once instead of once per step
+_APT_PACKAGES = set()
+_APT_UPDATED = False
+
+# apt-fast (with aria2) downloads the .deb archives over parallel
+# connections; None until checked
+_APT_FAST = None
+APT_FAST_SETTINGS = {"_MAXNUM": "16", "_MAXCONPERSRV": "8", "_SPLITCON": "8"}
+
+# PyTorch release built from source on RISC-V; the checkout is kept so a
+# failed build can be retried without cloning again
+PYTORCH_VERSION = "v2.1.0"
+PYTORCH_SRC = Path.home() / ".cache" / "meetingassistant" / f"pytorch-{PYTORCH_VERSION}"
+
+# Output of `arecord -l` (None if unavailable), listed once per run
+_ARECORD_CACHE = None
+_ARECORD_CHECKED = False
+
+# Capture devices in /proc/asound/pcm ("00-00: id : name : capture 1")
+# and cards in `arecord -l` output ("card 0: ...")
+_PCM_CAPTURE_RE = re.compile(r'^(\d+)-\d+:.*\bcapture \d+', re.M)
+_ARECORD_CARD_RE = re.compile(r'^card (\d+):', re.M)
+
+# config.yaml settings chosen during installation, keyed by their path in
+# the YAML tree; write_config() applies them all in one pass
+CONFIG_PATH = Path("config.yaml")
+_CONFIG_UPDATES = {}
+_CONFIG_KEY_RE = re.compile(r'^(\s*)([\w.-]+):[ \t]*([^#\n]*?)([ \t]*#.*)?$')
+
+# pip downloads, shared by all package groups and kept for reinstalls
+WHEEL_CACHE = Path.home() / ".cache" / "meetingassistant-wheels"
+
 # ANSI color codes
 class Colors:
     RED = '\033[0;31m'
@@ -35,10 +74,11 @@ def print_error(message: str):
 def print_header(message: str):
     print(f"{Colors.BLUE}=== {message} ==={Colors.NC}")
 
-def run_command(cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
+def run_command(cmd: List[str], check: bool = True,
+                timeout: Optional[float] = None) -> subprocess.CompletedProcess:
     """Run a command and return the result"""
     try:
-        return subprocess.run(cmd, check=check, capture_output=True, text=True)
+        return subprocess.run(cmd, check=check, capture_output=True, text=True, timeout=timeout)
     except subprocess.CalledProcessError as e:
         if check:
             print_error(f"Command failed: {' '.join(cmd)}")
@@ -46,10 +86,131 @@ def run_command(cmd: List[str], check: bool = True) -> subprocess.CompletedProce
             raise
         return e
 
+@functools.lru_cache(maxsize=None)
 def command_exists(cmd: str) -> bool:
-    """Check if a command exists in PATH"""
+    """Check if a command exists in PATH (cached, see flush_apt)"""
     return shutil.which(cmd) is not None
 
+def list_recording_devices() -> Optional[str]:
+    """Return the output of `arecord -l`, or None if it lists nothing
+
+    The device list is only read once per run.
+    """
+    global _ARECORD_CACHE, _ARECORD_CHECKED
+    if not _ARECORD_CHECKED:
+        if command_exists("arecord"):
+            result = run_command(["arecord", "-l"], check=False)
+            if result.returncode == 0 and result.stdout:
+                _ARECORD_CACHE = result.stdout
+        _ARECORD_CHECKED = True
+    return _ARECORD_CACHE
+
+def queue_apt(packages: List[str]):
+    """Queue system packages for the next flush_apt()"""
+    _APT_PACKAGES.update(packages)
+
+def is_ubuntu() -> bool:
+    """Check /etc/os-release for ID=ubuntu"""
+    try:
+        with open("/etc/os-release") as f:
+            return any(line.strip() in ("ID=ubuntu", 'ID="ubuntu"') for line in f)
+    except OSError:
+        return False
+
+def ensure_apt_fast() -> bool:
+    """Make apt-fast available if possible (once per run)
+
+    apt-fast is installed from its Ubuntu PPA, so it is only installed on
+    Ubuntu; Debian-based systems (Raspberry Pi OS, Armbian) also have
+    add-apt-repository, but the PPA has no suites for their codenames.
+    Elsewhere plain apt is used.
+    """
+    global _APT_FAST
+    if _APT_FAST is not None:
+        return _APT_FAST
+
+    if (shutil.which("apt-fast") is None and shutil.which("add-apt-repository")
+            and is_ubuntu()):
+        print_status("Installing apt-fast for parallel package downloads")
+        # Preseed the package questions so the install is non-interactive
+        preseed = "\n".join([
+            "apt-fast apt-fast/maxdownloads string 16",
+            "apt-fast apt-fast/dlflag boolean true",
+            "apt-fast apt-fast/aptmanager string apt-get",
+        ])
+        run_command(["sudo", "sh", "-c",
+                     f"printf '%s\\n' '{preseed}' | debconf-set-selections"
+                     " && add-apt-repository -y ppa:apt-fast/stable"
+                     " && apt-get update"
+                     " && DEBIAN_FRONTEND=noninteractive apt-get install -y aria2 apt-fast"],
+                    check=False)
+
+        # Don't leave the PPA behind if the install did not work out
+        if shutil.which("apt-fast") is None:
+            run_command(["sudo", "add-apt-repository", "-y", "-r", "ppa:apt-fast/stable"],
+                        check=False)
+
+        # apt-fast sources its config over the environment, so the
+        # connection limits are set there (only on a fresh install, an
+        # existing config is left alone)
+        if shutil.which("apt-fast"):
+            sed_args = []
+            for key, value in APT_FAST_SETTINGS.items():
+                sed_args += ["-e", f"s/^#*{key}=.*/{key}={value}/"]
+            run_command(["sudo", "sed", "-i", "-E"] + sed_args + ["/etc/apt-fast.conf"],
+                        check=False)
+
+    _APT_FAST = shutil.which("apt-fast") is not None
+    if not _APT_FAST:
+        print_warning("apt-fast not available - downloading packages with apt")
+    return _APT_FAST
+
+def flush_apt() -> bool:
+    """Install all queued system packages with a single apt transaction"""
+    global _APT_UPDATED
+    if not _APT_PACKAGES:
+        return True
+
+    packages = sorted(_APT_PACKAGES)
+    print_status(f"Installing packages: {', '.join(packages)}")
+
+    # The package index only needs refreshing once per run
+    if not _APT_UPDATED:
+        run_command(["sudo", "apt-get", "update"])
+        _APT_UPDATED = True
+
+    install_args = ["install", "-y", "--no-install-recommends"] + packages
+    result = None
+    if ensure_apt_fast():
+        result = run_command(["sudo", "apt-fast"] + install_args, check=False)
+        if result.returncode != 0:
+            print_warning("apt-fast failed - retrying with apt")
+    if result is None or result.returncode != 0:
+        run_command(["sudo", "apt-get"] + install_args)
+    _APT_PACKAGES.clear()
+
+    # Newly installed packages may provide commands that were missing
+    command_exists.cache_clear()
+    return True
+
+def detect_capture_card() -> Optional[str]:
+    """Return the number of the first ALSA card that can record
+
+    Reads /proc/asound/pcm, which needs no subprocess and works without
+    alsa-utils; `arecord -l` is only used if that file is unavailable.
+    """
+    pcm_path = Path("/proc/asound/pcm")
+    if pcm_path.exists():
+        try:
+            match = _PCM_CAPTURE_RE.search(pcm_path.read_text())
+            return str(int(match.group(1))) if match else None
+        except OSError:
+            pass
+
+    match = _ARECORD_CARD_RE.search(list_recording_devices() or "")
+    return match.group(1) if match else None
+
+@functools.lru_cache(maxsize=None)
 def detect_system() -> Tuple[str, str, str]:
     """Detect system architecture and SBC type"""
     print_header("System Detection")
@@ -116,33 +277,22 @@ def check_dependencies() -> bool:
         else:
             missing_deps.append(cmd)
 
-    # Check Python version
-    if command_exists("python3"):
-        result = run_command(["python3", "--version"])
-        python_version = result.stdout.split()[1]
-        print_status(f"Python version: {python_version}")
-
-        # Check if Python version is >= 3.8
-        version_check = run_command([
-            "python3", "-c",
-            "import sys; exit(0 if sys.version_info >= (3, 8) else 1)"
-        ], check=False)
+    # Check Python version (this script already runs under python3)
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+    print_status(f"Python version: {python_version}")
 
-        if version_check.returncode == 0:
-            print_status("Python version is compatible")
-        else:
-            print_error("Python 3.8 or higher is required")
-            return False
+    if sys.version_info >= (3, 8):
+        print_status("Python version is compatible")
+    else:
+        print_error("Python 3.8 or higher is required")
+        return False
 
     if missing_deps:
         print_error(f"Missing dependencies: {', '.join(missing_deps)}")
-        print_status("Installing missing dependencies...")
+        print_status("Queueing missing dependencies for installation...")
 
-        # Update package list
-        run_command(["sudo", "apt", "update"])
-
-        # Install missing dependencies
-        run_command(["sudo", "apt", "install", "-y"] + missing_deps)
+        # pip3 is the only command whose package has a different name
+        queue_apt(["python3-pip" if dep == "pip3" else dep for dep in missing_deps])
 
     return True
 
@@ -186,9 +336,12 @@ def install_system_packages(sbc_type: str) -> bool:
             "libblas-dev"
         ])
 
-    print_status(f"Installing packages: {', '.join(packages)}")
-    run_command(["sudo", "apt", "update"])
-    run_command(["sudo", "apt", "install", "-y"] + packages)
+    # Audio tools used by setup_audio(); it runs after these are installed
+    packages.append("alsa-utils")
+    if not command_exists("pulseaudio"):
+        packages.extend(["pulseaudio", "pulseaudio-utils"])
+
+    queue_apt(packages)
 
     return True
 
@@ -196,12 +349,15 @@ def setup_audio() -> bool:
     """Setup audio system"""
     print_header("Setting up Audio System")
 
-    # Check if user is in audio group
+    # Check if user is in audio group. os.getlogin() fails without a
+    # controlling terminal, and gr_mem misses the primary group and
+    # memberships from LDAP/SSSD, so ask getgrouplist() instead.
     import grp
+    import pwd
     try:
         audio_group = grp.getgrnam('audio')
-        current_user = os.getlogin()
-        if current_user not in audio_group.gr_mem:
+        current_user = pwd.getpwuid(os.getuid()).pw_name
+        if audio_group.gr_gid not in os.getgrouplist(current_user, os.getgid()):
             print_status("Adding user to audio group")
             run_command(["sudo", "usermod", "-a", "-G", "audio", current_user])
             print_warning("You need to log out and log back in for audio group changes to take effect")
@@ -213,9 +369,9 @@ def setup_audio() -> bool:
 
     if command_exists("arecord"):
         print_status("Available recording devices:")
-        result = run_command(["arecord", "-l"], check=False)
-        if result.returncode == 0:
-            print(result.stdout)
+        devices = list_recording_devices()
+        if devices:
+            print(devices)
         else:
             print_warning("No recording devices found")
 
@@ -230,8 +386,7 @@ def setup_audio() -> bool:
             if start_result.returncode != 0:
                 print_warning("Failed to start PulseAudio")
     else:
-        print_status("Installing PulseAudio")
-        run_command(["sudo", "apt", "install", "-y", "pulseaudio", "pulseaudio-utils"])
+        print_warning("PulseAudio is not available")
 
     return True
 
@@ -253,6 +408,24 @@ def setup_python_env() -> bool:
 
     return True
 
+def build_jobs(gb_per_job: int = 2) -> int:
+    """Number of parallel compile jobs for a large C++ build
+
+    Each PyTorch translation unit can take over 1GB to compile, so using
+    every core OOMs boards with little RAM. Allows one job per
+    gb_per_job GB of available memory, capped at the core count.
+    """
+    cpus = os.cpu_count() or 4
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    mem_gb = int(line.split()[1]) // (1024 * 1024)
+                    return max(1, min(cpus, mem_gb // gb_per_job))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
 def install_pytorch(arch: str = "aarch64", sbc_type: str = "generic") -> bool:
     """Install PyTorch for ARM64/RISC-V"""
     print_header("Installing PyTorch")
@@ -288,23 +461,32 @@ def install_pytorch(arch: str = "aarch64", sbc_type: str = "generic") -> bool:
                         "libopenblas-dev", "libblas-dev", "m4",
                         "python3-dev", "python3-yaml", "python3-setuptools"
                     ]
-                    run_command(["sudo", "apt", "install", "-y"] + build_deps)
+                    queue_apt(build_deps)
+                    flush_apt()
 
                     # Install Python build dependencies
                     run_command([str(pip_path), "install", "pyyaml", "numpy", "setuptools", "cffi", "typing_extensions"])
 
-                    # Clone PyTorch
-                    print_status("Cloning PyTorch repository...")
-                    pytorch_dir = Path("/tmp/pytorch")
-                    if pytorch_dir.exists():
-                        shutil.rmtree(pytorch_dir)
-
-                    run_command(["git", "clone", "--recursive", "--branch", "v2.1.0",
-                               "https://github.com/pytorch/pytorch", str(pytorch_dir)])
+                    # Reuse the checkout of an earlier (failed) build
+                    # attempt; otherwise clone only the release commit
+                    pytorch_dir = PYTORCH_SRC
+                    describe = run_command(["git", "-C", str(pytorch_dir), "describe", "--tags"],
+                                           check=False) if (pytorch_dir / ".git").exists() else None
+                    if describe is not None and describe.stdout.strip() == PYTORCH_VERSION:
+                        print_status(f"Reusing PyTorch {PYTORCH_VERSION} checkout in {pytorch_dir}")
+                    else:
+                        print_status("Cloning PyTorch repository...")
+                        if pytorch_dir.exists():
+                            shutil.rmtree(pytorch_dir)
+                        pytorch_dir.parent.mkdir(parents=True, exist_ok=True)
+
+                        run_command(["git", "clone", "--depth", "1", "--shallow-submodules",
+                                     "--recurse-submodules", "-j", str(os.cpu_count() or 4),
+                                     "--branch", PYTORCH_VERSION,
+                                     "https://github.com/pytorch/pytorch", str(pytorch_dir)])
 
                     # Build PyTorch
                     print_status("Building PyTorch (this will take 6-12 hours)...")
-                    os.chdir(pytorch_dir)
 
                     # Set environment variables for RISC-V build
                     env = os.environ.copy()
@@ -314,12 +496,24 @@ def install_pytorch(arch: str = "aarch64", sbc_type: str = "generic") -> bool:
                     env["USE_NNPACK"] = "0"
                     env["USE_QNNPACK"] = "0"
                     env["BUILD_TEST"] = "0"
-                    env["MAX_JOBS"] = str(os.cpu_count() or 4)
-
-                    subprocess.run([str(python_path), "setup.py", "install"], env=env, check=True)
-
-                    # Return to original directory
-                    os.chdir(Path(__file__).parent.absolute())
+                    # Bounded by memory as well as cores; no debug info
+                    # and -O2 roughly halve the compiler's peak memory
+                    max_jobs = str(build_jobs())
+                    print_status(f"Building with {max_jobs} parallel jobs")
+                    env["MAX_JOBS"] = max_jobs
+                    env["CMAKE_BUILD_PARALLEL_LEVEL"] = max_jobs
+                    env["NINJA_STATUS"] = "[%f/%t %es] "
+                    env["CFLAGS"] = "-g0 -O2"
+                    env["CXXFLAGS"] = "-g0 -O2"
+
+                    # ccache makes rebuilds after a failed attempt fast;
+                    # setup.py passes CMAKE_* variables on to CMake
+                    if command_exists("ccache"):
+                        env["CMAKE_C_COMPILER_LAUNCHER"] = "ccache"
+                        env["CMAKE_CXX_COMPILER_LAUNCHER"] = "ccache"
+
+                    subprocess.run([str(python_path.absolute()), "setup.py", "install"],
+                                   cwd=pytorch_dir, env=env, check=True)
 
                     print_status("PyTorch built and installed successfully")
 
@@ -390,7 +584,8 @@ def install_onnxruntime_riscv(pip_path: Path, python_path: Path) -> bool:
 
             # Install build dependencies
             build_deps = ["cmake", "ninja-build", "protobuf-compiler", "libprotobuf-dev"]
-            run_command(["sudo", "apt", "install", "-y"] + build_deps)
+            queue_apt(build_deps)
+            flush_apt()
 
             # Install Python dependencies
             run_command([str(pip_path), "install", "numpy", "packaging", "protobuf"])
@@ -439,59 +634,140 @@ def install_python_deps(arch: str = "aarch64") -> bool:
 
         print_status("Installing SciPy (may take 10-30 minutes on RISC-V)...")
         print_warning("SciPy is being compiled from source - this is normal for RISC-V")
-        scipy_result = run_command([str(pip_path), "install", "scipy"], check=False, timeout=3600000)  # 1 hour timeout
-        if scipy_result.returncode != 0:
+        try:
+            scipy_result = run_command([str(pip_path), "install", "scipy"], check=False, timeout=3600)  # 1 hour timeout
+        except subprocess.TimeoutExpired:
+            scipy_result = None
+        if scipy_result is None or scipy_result.returncode != 0:
             print_warning("SciPy installation failed - continuing without it")
             print_status("Note: Core functionality will work without SciPy")
-    else:
-        # For non-RISC-V, install normally
-        print_status("Installing basic dependencies")
-        run_command([str(pip_path), "install", "numpy", "scipy"])
-
-    # Audio processing
-    print_status("Installing audio processing dependencies")
-    run_command([str(pip_path), "install", "pyaudio", "pydub", "soundfile"])
-
-    # Web framework
-    print_status("Installing web framework dependencies")
-    run_command([str(pip_path), "install", "fastapi", "uvicorn", "jinja2", "python-multipart", "python-socketio"])
-
-    # CLI tools
-    print_status("Installing CLI dependencies")
-    run_command([str(pip_path), "install", "click", "rich"])
-
-    # Utilities
-    print_status("Installing utility dependencies")
-    run_command([str(pip_path), "install", "python-dotenv", "requests", "aiofiles", "sqlalchemy", "pyyaml"])
-
-    # STT engines
-    print_status("Installing Speech-to-Text engines")
-    whisper_result = run_command([str(pip_path), "install", "openai-whisper"], check=False)
-    if whisper_result.returncode != 0:
-        print_warning("Whisper installation failed - may need PyTorch first")
-
-    run_command([str(pip_path), "install", "SpeechRecognition", "vosk"], check=False)
-
-    # AI/ML dependencies
-    print_status("Installing AI/ML dependencies")
-    transformers_result = run_command([str(pip_path), "install", "transformers", "accelerate", "sentencepiece", "protobuf"], check=False)
-    if transformers_result.returncode != 0:
-        print_warning("Some AI/ML dependencies failed - may work with ONNX Runtime instead")
-
-    # Install optional dependencies
-    print_status("Installing optional dependencies")
-    ollama_result = run_command([str(pip_path), "install", "ollama"], check=False)
-    if ollama_result.returncode != 0:
-        print_warning("Ollama client installation failed (optional)")
-
-    # Install ONNX Runtime (useful for EIC7700 NPU)
-    print_status("Installing ONNX Runtime")
-    onnx_result = run_command([str(pip_path), "install", "onnxruntime"], check=False)
-    if onnx_result.returncode != 0:
-        print_warning("ONNX Runtime installation failed (optional, but recommended for EIC7700)")
+
+    # Independent package groups: (description, packages, optional,
+    # warning shown if an optional group fails). STT comes after PyTorch,
+    # which install_pytorch() has already installed at this point.
+    groups = [
+        ("audio processing dependencies", ["pyaudio", "pydub", "soundfile"], False, None),
+        ("web framework dependencies",
+         ["fastapi", "uvicorn", "jinja2", "python-multipart", "python-socketio"], False, None),
+        ("CLI dependencies", ["click", "rich"], False, None),
+        ("utility dependencies",
+         ["python-dotenv", "requests", "aiofiles", "sqlalchemy", "pyyaml"], False, None),
+        ("Whisper", ["openai-whisper"], True,
+         "Whisper installation failed - may need PyTorch first"),
+        ("Speech-to-Text engines", ["SpeechRecognition", "vosk"], True, None),
+        ("AI/ML dependencies", ["transformers", "accelerate", "sentencepiece", "protobuf"], True,
+         "Some AI/ML dependencies failed - may work with ONNX Runtime instead"),
+        ("optional dependencies", ["ollama"], True,
+         "Ollama client installation failed (optional)"),
+        ("fast model downloads", ["hf_transfer"], True, None),
+        ("ONNX Runtime", ["onnxruntime"], True,
+         "ONNX Runtime installation failed (optional, but recommended for EIC7700)"),
+    ]
+
+    # Elsewhere NumPy/SciPy have wheels and go with the other packages
+    if arch not in ["riscv64", "riscv"]:
+        groups.insert(0, ("basic dependencies", ["numpy", "scipy"], False, None))
+
+    # Downloads are network bound and run concurrently; installing stays in
+    # a single pip process because parallel pip runs would race on the venv
+    print_status("Downloading Python packages...")
+    WHEEL_CACHE.mkdir(parents=True, exist_ok=True)
+
+    def download(packages):
+        return run_command([
+            str(pip_path), "download", "--no-input", "--prefer-binary",
+            "--dest", str(WHEEL_CACHE), "--find-links", str(WHEEL_CACHE)
+        ] + packages, check=False)
+
+    # pip download ignores installed packages, so groups depending on
+    # PyTorch would fetch another copy of it; those resolve at install time
+    torch_groups = {"Whisper", "AI/ML dependencies"}
+    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        list(executor.map(download, [
+            packages for description, packages, _, _ in groups
+            if description not in torch_groups
+        ]))
+
+    # One resolver pass over all groups; only if that fails are the groups
+    # installed one by one, so a failing optional package cannot block the
+    # required ones. Wheels are preferred on ARM64 to skip source builds.
+    pip_install = [str(pip_path), "install", "--no-input", "--find-links", str(WHEEL_CACHE)]
+    if arch in ["aarch64", "arm64"]:
+        pip_install.append("--prefer-binary")
+
+    print_status("Installing Python dependencies")
+    result = run_command(
+        pip_install + [package for _, packages, _, _ in groups for package in packages],
+        check=False
+    )
+    if result.returncode == 0:
+        print_status("All Python dependencies installed")
+        return True
+
+    print_warning("Combined install failed - installing package groups separately")
+    results = {}
+    for description, packages, optional, failure_message in groups:
+        print_status(f"Installing {description}")
+        results[description] = run_command(pip_install + packages, check=not optional).returncode
+
+        if results[description] != 0 and failure_message:
+            print_warning(failure_message)
 
     return True
 
+def update_config(key_path: Tuple[str, ...], value):
+    """Record a config.yaml setting for write_config()
+
+    Args:
+        key_path: Keys leading to the setting, e.g. ("audio", "input_device")
+        value: New value (str, int, bool or None)
+    """
+    _CONFIG_UPDATES[key_path] = value
+
+def write_config() -> bool:
+    """Write all recorded settings to config.yaml in a single pass
+
+    The file is edited line by line rather than re-dumped, so comments and
+    formatting are kept, and each setting is found by its position in the
+    YAML tree instead of by its current value.
+    """
+    if not _CONFIG_UPDATES or not CONFIG_PATH.exists():
+        return False
+
+    try:
+        lines = CONFIG_PATH.read_text().split('\n')
+        parents = []  # (indent, key) of the enclosing mappings
+        for i, line in enumerate(lines):
+            match = _CONFIG_KEY_RE.match(line)
+            if not match:
+                continue
+
+            indent, key = len(match.group(1)), match.group(2)
+            while parents and parents[-1][0] >= indent:
+                parents.pop()
+            key_path = tuple(parent for _, parent in parents) + (key,)
+            parents.append((indent, key))
+
+            if key_path in _CONFIG_UPDATES:
+                value = _CONFIG_UPDATES[key_path]
+                if value is None:
+                    value = "null"
+                elif isinstance(value, bool):
+                    value = str(value).lower()
+                elif isinstance(value, str):
+                    value = f'"{value}"'
+                comment = match.group(4) or ''
+                if comment and not comment[0].isspace():
+                    comment = "  " + comment
+                lines[i] = f"{match.group(1)}{key}: {value}{comment}"
+
+        CONFIG_PATH.write_text('\n'.join(lines))
+        _CONFIG_UPDATES.clear()
+        return True
+    except Exception as e:
+        print_warning(f"Failed to update config.yaml: {e}")
+        return False
+
 def get_user_choice(prompt: str, options: List[str], default: str = "1") -> str:
     """Get user choice with validation"""
     print(f"\n{prompt}")
@@ -505,8 +781,8 @@ def get_user_choice(prompt: str, options: List[str], default: str = "1") -> str:
 
     return choice
 
-def download_whisper_model() -> bool:
-    """Download Whisper model"""
+def choose_whisper_model() -> str:
+    """Ask for the Whisper model size"""
     options = [
         "tiny - Fastest, lowest accuracy (~40MB)",
         "base - Good balance (default, ~150MB)",
@@ -517,8 +793,10 @@ def download_whisper_model() -> bool:
     choice = get_user_choice("Choose Whisper model size:", options, "2")
 
     model_map = {"1": "tiny", "2": "base", "3": "small", "4": "medium"}
-    model_name = model_map.get(choice, "base")
+    return model_map.get(choice, "base")
 
+def download_whisper_model(model_name: str) -> bool:
+    """Download Whisper model"""
     print_status(f"Downloading Whisper '{model_name}' model...")
 
     python_path = Path("venv/bin/python3")
@@ -535,21 +813,12 @@ print('Whisper {model_name} model downloaded successfully')
         return False
 
     # Update config with selected model
-    config_path = Path("config.yaml")
-    if config_path.exists():
-        try:
-            with open(config_path, 'r') as f:
-                content = f.read()
-            content = content.replace('model_size: "base"', f'model_size: "{model_name}"')
-            with open(config_path, 'w') as f:
-                f.write(content)
-        except Exception:
-            pass
+    update_config(("stt", "engines", "whisper", "model_size"), model_name)
 
     return True
 
-def download_vosk_model() -> bool:
-    """Download Vosk model"""
+def choose_vosk_model() -> Tuple[str, str]:
+    """Ask for the Vosk model, returning its URL and directory name"""
     options = [
         "US English (22MB) - Standard quality",
         "US English Large (1.8GB) - High quality",
@@ -564,36 +833,62 @@ def download_vosk_model() -> bool:
         "3": ("https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip", "vosk-model-small-en-us-0.15")
     }
 
-    vosk_url, vosk_name = model_urls.get(choice, model_urls["1"])
+    return model_urls.get(choice, model_urls["1"])
 
-    print_status("Downloading Vosk model...")
+def download_vosk_model(vosk_url: str, vosk_name: str) -> bool:
+    """Download Vosk model"""
     models_dir = Path("models")
     models_dir.mkdir(exist_ok=True)
 
-    zip_path = models_dir / "vosk-model.zip"
+    # The selected model is always installed under the standard name
+    new_path = models_dir / "vosk-model-en-us-0.22"
+    if new_path.is_dir() and any(new_path.iterdir()):
+        print_status("Vosk model already installed")
+        return True
 
-    try:
-        urllib.request.urlretrieve(vosk_url, zip_path)
+    print_status("Downloading Vosk model...")
+
+    # A download interrupted on an earlier run is continued with an HTTP
+    # range request instead of starting over
+    part_path = models_dir / f"{vosk_name}.zip.part"
+    offset = part_path.stat().st_size if part_path.exists() else 0
 
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+    try:
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with urllib.request.urlopen(urllib.request.Request(vosk_url, headers=headers)) as response:
+                # 206 continues the partial file, 200 sends it all again
+                with open(part_path, 'ab' if response.status == 206 else 'wb') as f:
+                    shutil.copyfileobj(response, f, length=1 << 20)
+        except urllib.error.HTTPError as e:
+            # 416: the partial file is already complete
+            if e.code != 416:
+                raise
+
+        # Extraction checks every member's CRC, so a corrupt download
+        # fails here and is removed below
+        with zipfile.ZipFile(part_path, 'r') as zip_ref:
             zip_ref.extractall(models_dir)
+        part_path.unlink()
 
         # Rename to standard name
         old_path = models_dir / vosk_name
-        new_path = models_dir / "vosk-model-en-us-0.22"
         if old_path.exists() and not new_path.exists():
             old_path.rename(new_path)
 
-        zip_path.unlink()
         print_status("Vosk model downloaded successfully")
         return True
 
+    except zipfile.BadZipFile as e:
+        part_path.unlink(missing_ok=True)
+        print_warning(f"Downloaded Vosk model is corrupt, please retry: {e}")
+        return False
     except Exception as e:
         print_warning(f"Failed to download Vosk model: {e}")
         return False
 
-def download_qwen_model() -> bool:
-    """Download Qwen model"""
+def choose_qwen_model() -> Optional[str]:
+    """Ask for the Qwen model, returning None if the download is declined"""
     options = [
         "Qwen 1.8B - Lightweight, ~2GB",
         "Qwen 3B - Balanced performance (default), ~3.5GB",
@@ -616,15 +911,28 @@ def download_qwen_model() -> bool:
 
     if confirm not in ['y', 'yes']:
         print_status("Skipping Qwen model download")
-        return True
+        return None
 
+    return qwen_model
+
+def download_qwen_model(qwen_model: str) -> bool:
+    """Download Qwen model"""
     python_path = Path("venv/bin/python3")
+    # Only fetch the files into the Hugging Face cache; loading the model
+    # just to cache it needs its full size in RAM. hf_transfer (if
+    # installed) downloads each file over several connections.
     download_script = f"""
-from transformers import AutoTokenizer, AutoModelForCausalLM
-print('Downloading tokenizer...')
-tokenizer = AutoTokenizer.from_pretrained('{qwen_model}')
-print('Downloading model...')
-model = AutoModelForCausalLM.from_pretrained('{qwen_model}')
+import importlib.util
+import os
+if importlib.util.find_spec('hf_transfer'):
+    os.environ['HF_HUB_ENABLE_HF_TRANSFER'] = '1'
+from huggingface_hub import snapshot_download
+print('Downloading {qwen_model}...')
+snapshot_download(
+    repo_id='{qwen_model}',
+    max_workers=8,
+    allow_patterns=['*.json', '*.safetensors', '*.model', '*.txt', 'tokenizer*']
+)
 print('Qwen model downloaded successfully')
 """
 
@@ -634,16 +942,7 @@ print('Qwen model downloaded successfully')
         return False
 
     # Update config with selected model
-    config_path = Path("config.yaml")
-    if config_path.exists():
-        try:
-            with open(config_path, 'r') as f:
-                content = f.read()
-            content = content.replace('model_name: "Qwen/Qwen2.5-3B-Instruct"', f'model_name: "{qwen_model}"')
-            with open(config_path, 'w') as f:
-                f.write(content)
-        except Exception:
-            pass
+    update_config(("summarization", "engines", "qwen3", "model_name"), qwen_model)
 
     return True
 
@@ -661,8 +960,14 @@ def setup_ollama() -> bool:
 
     # Download and run Ollama install script
     try:
-        install_script = urllib.request.urlopen("https://ollama.ai/install.sh").read().decode()
-        result = subprocess.run(["sh"], input=install_script, text=True, check=True)
+        # Stream the script to a temp file instead of reading it into
+        # memory, and only run it once it has downloaded completely so a
+        # dropped connection can't execute a truncated script
+        with tempfile.NamedTemporaryFile("wb", suffix=".sh") as script, \
+                urllib.request.urlopen("https://ollama.ai/install.sh") as response:
+            shutil.copyfileobj(response, script)
+            script.flush()
+            subprocess.run(["sh", script.name], check=True)
         print_status("Ollama installed successfully")
     except Exception as e:
         print_warning(f"Failed to install Ollama: {e}")
@@ -702,16 +1007,7 @@ def setup_ollama() -> bool:
             run_command(["ollama", "pull", model_name])
 
             # Update config
-            config_path = Path("config.yaml")
-            if config_path.exists():
-                try:
-                    with open(config_path, 'r') as f:
-                        content = f.read()
-                    content = content.replace('model_name: "qwen2.5:3b"', f'model_name: "{model_name}"')
-                    with open(config_path, 'w') as f:
-                        f.write(content)
-                except Exception:
-                    pass
+            update_config(("summarization", "engines", "ollama", "model_name"), model_name)
         elif choice != "5":
             print_status("Invalid choice, downloading qwen2.5:3b...")
             run_command(["ollama", "pull", "qwen2.5:3b"])
@@ -737,14 +1033,13 @@ def download_models():
 
     stt_choice = get_user_choice("Which STT models would you like to install?", stt_options, "1")
 
-    if stt_choice == "1":
-        download_whisper_model()
-    elif stt_choice == "2":
-        download_vosk_model()
-    elif stt_choice == "3":
-        download_whisper_model()
-        download_vosk_model()
-    else:
+    # Ask all model questions first, so the downloads can run unattended
+    downloads = []
+    if stt_choice in ["1", "3"]:
+        downloads.append((download_whisper_model, choose_whisper_model()))
+    if stt_choice in ["2", "3"]:
+        downloads.append((download_vosk_model, *choose_vosk_model()))
+    if stt_choice not in ["1", "2", "3"]:
         print_status("Skipping STT model download")
 
     # Summarization models
@@ -757,14 +1052,23 @@ def download_models():
 
     sum_choice = get_user_choice("Which summarization setup would you like?", sum_options, "2")
 
-    if sum_choice == "1":
-        download_qwen_model()
-    elif sum_choice == "2":
-        setup_ollama()
-    elif sum_choice == "3":
-        download_qwen_model()
+    if sum_choice in ["1", "3"]:
+        qwen_model = choose_qwen_model()
+        if qwen_model:
+            downloads.append((download_qwen_model, qwen_model))
+
+    # The models come from different hosts, so downloading them in
+    # parallel takes about as long as the largest one
+    if downloads:
+        with ThreadPoolExecutor(max_workers=len(downloads)) as executor:
+            futures = [executor.submit(download, *args) for download, *args in downloads]
+            for future in futures:
+                future.result()
+
+    # Ollama setup asks more questions along the way, so it runs afterwards
+    if sum_choice in ["2", "3"]:
         setup_ollama()
-    else:
+    elif sum_choice != "1":
         print_status("Skipping local summarization models")
 
 def create_config():
@@ -773,32 +1077,15 @@ def create_config():
 
     # Auto-detect default audio device
     default_device = "null"
-    if command_exists("arecord"):
-        result = run_command(["arecord", "-l"], check=False)
-        if result.returncode == 0 and result.stdout:
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'card' in line:
-                    parts = line.split(':')
-                    if len(parts) > 0:
-                        card_part = parts[0].strip()
-                        if 'card' in card_part:
-                            default_device = card_part.split()[-1]
-                            break
+    card = detect_capture_card()
+    if card is not None:
+        default_device = card
 
     print_status(f"Detected audio device: {default_device}")
 
     # Update config with detected device
-    config_path = Path("config.yaml")
-    if config_path.exists():
-        try:
-            with open(config_path, 'r') as f:
-                content = f.read()
-            content = content.replace('input_device: null', f'input_device: {default_device}')
-            with open(config_path, 'w') as f:
-                f.write(content)
-        except Exception:
-            pass
+    update_config(("audio", "input_device"),
+                  None if default_device == "null" else int(default_device))
 
 def create_scripts():
     """Create startup scripts"""
@@ -809,7 +1096,6 @@ def create_scripts():
         f.write('''#!/usr/bin/env python3
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 # Change to script directory
@@ -822,9 +1108,9 @@ if not venv_python.exists():
     print("Error: Virtual environment not found. Please run install_sbc.py first.")
     sys.exit(1)
 
-# Run CLI with arguments
-cmd = [str(venv_python), "cli.py"] + sys.argv[1:]
-subprocess.run(cmd)
+# Run CLI with arguments, replacing this launcher process
+sys.stdout.flush()
+os.execv(str(venv_python), [str(venv_python), "cli.py"] + sys.argv[1:])
 ''')
 
     # Create web launcher script
@@ -832,7 +1118,6 @@ subprocess.run(cmd)
         f.write('''#!/usr/bin/env python3
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 # Change to script directory
@@ -845,8 +1130,9 @@ if not venv_python.exists():
     print("Error: Virtual environment not found. Please run install_sbc.py first.")
     sys.exit(1)
 
-# Run web app
-subprocess.run([str(venv_python), "web_app.py"])
+# Run web app, replacing this launcher process
+sys.stdout.flush()
+os.execv(str(venv_python), [str(venv_python), "web_app.py"])
 ''')
 
     # Create test script
@@ -1203,6 +1489,9 @@ def main():
                 sys.exit(1)
 
             install_system_packages(sbc_type)
+            # One apt transaction for everything queued above, before the
+            # audio setup that uses arecord and pulseaudio
+            flush_apt()
             setup_audio()
             setup_python_env()
             install_pytorch(arch, sbc_type)
@@ -1228,6 +1517,11 @@ def main():
 
         if not args.models_only:
             create_config()
+
+        # Save the model and device choices made above
+        write_config()
+
+        if not args.models_only:
             create_scripts()
             optimize_sbc()
             test_installation()
@@ -1243,14 +1537,11 @@ def main():
         print()
         print("Microphone devices detected:")
         if command_exists("arecord"):
-            result = run_command(["arecord", "-l"], check=False)
-            if result.returncode == 0 and result.stdout:
-                lines = [line for line in result.stdout.split('\n') if 'card' in line]
-                if lines:
-                    for line in lines:
-                        print(line)
-                else:
-                    print("No recording devices found")
+            devices = list_recording_devices()
+            lines = [line for line in (devices or "").split('\n') if 'card' in line]
+            if lines:
+                for line in lines:
+                    print(line)
             else:
                 print("No recording devices found")
         print()
@@ -8,8 +8,12 @@ and summarization.
 
 import time
 import json
+import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
 from datetime import datetime
 
 from src.config import config
@@ -60,20 +64,42 @@ class MeetingAssistant:
         """Initialize the Meeting Assistant with all required components."""
         logger.info("Initializing Meeting Assistant")
 
-        self.stt_manager = STTManager(config.stt.to_dict())
-        self.summarization_manager = SummarizationManager(
-            config.summarization.to_dict()
-        )
+        # Engine managers load models, so they are created on first use
+        # (or by initialize()) rather than here
+        self._stt_manager: Optional[STTManager] = None
+        self._summarization_manager: Optional[SummarizationManager] = None
         self.audio_recorder = AudioRecorder(config.audio.to_dict())
 
         self.current_meeting: Optional[dict[str, Any]] = None
         self.real_time_transcript = ""
+        self._transcript_listeners: list[Callable[[str], None]] = []
 
         logger.debug("Meeting Assistant components created")
 
-    def initialize(self) -> bool:
+    @property
+    def stt_manager(self) -> STTManager:
+        """Speech-to-text manager, created (and its engine loaded) on first use."""
+        if self._stt_manager is None:
+            self._stt_manager = STTManager(config.stt.to_dict())
+        return self._stt_manager
+
+    @property
+    def summarization_manager(self) -> SummarizationManager:
+        """Summarization manager, created (and its engine loaded) on first use."""
+        if self._summarization_manager is None:
+            self._summarization_manager = SummarizationManager(
+                config.summarization.to_dict()
+            )
+        return self._summarization_manager
+
+    def initialize(self, stt: bool = True, summarization: bool = True) -> bool:
         """Initialize all components and check system readiness.
 
+        Args:
+            stt: Load the STT engine now. When False it is loaded on first
+                 use instead, e.g. for commands that only list devices.
+            summarization: Load the summarization engine now, as for ``stt``
+
         Returns:
             True if initialization successful (always returns True to allow
             web server to start even if audio is unavailable)
@@ -104,11 +130,48 @@ class MeetingAssistant:
                 exc_info=True
             )
 
+        if stt:
+            self.initialize_stt()
+        if summarization:
+            self.initialize_summarization()
+
         logger.info(
             f"Meeting Assistant initialized successfully (audio: {audio_success})"
         )
         return True  # Always return True for web server to start
 
+    def initialize_stt(self) -> bool:
+        """Create the STT manager and load its default engine.
+
+        Returns:
+            True if the STT manager is available, False if it failed to load
+
+        Example:
+            >>> assistant.initialize(stt=False, summarization=False)
+            >>> if assistant.initialize_stt():
+            ...     print(assistant.stt_manager.current_engine_name)
+        """
+        try:
+            return self.stt_manager is not None
+        except Exception as e:
+            logger.error(f"STT initialization error: {e}", exc_info=True)
+            return False
+
+    def initialize_summarization(self) -> bool:
+        """Create the summarization manager and load its default engine.
+
+        Returns:
+            True if the summarization manager is available, False if it
+            failed to load
+        """
+        try:
+            return self.summarization_manager is not None
+        except Exception as e:
+            logger.error(
+                f"Summarization initialization error: {e}", exc_info=True
+            )
+            return False
+
     def get_available_stt_engines(self) -> list[str]:
         """Get list of available STT engine names.
 
@@ -209,6 +272,28 @@ class MeetingAssistant:
         logger.debug(f"Engine status: {status}")
         return status
 
+    def add_transcript_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback for new real-time transcript text.
+
+        Args:
+            listener: Called with each newly transcribed chunk of text.
+                Runs on the audio processing thread, so it must be quick
+                and thread-safe.
+
+        Example:
+            >>> assistant.add_transcript_listener(lambda text: print(text))
+        """
+        self._transcript_listeners.append(listener)
+
+    def remove_transcript_listener(self, listener: Callable[[str], None]) -> None:
+        """Unregister a callback added with add_transcript_listener().
+
+        Args:
+            listener: The previously registered callback
+        """
+        if listener in self._transcript_listeners:
+            self._transcript_listeners.remove(listener)
+
     def start_meeting(
         self,
         title: Optional[str] = None,
@@ -309,6 +394,81 @@ class MeetingAssistant:
             ...     print(f"Transcript: {result['transcript']}")
             ...     print(f"Summary: {result['summary']['summary']}")
         """
+        full_transcript = self._finish_recording()
+
+        # Generate summary if auto-summarize is enabled
+        summary_result = None
+        if config.processing.auto_summarize and full_transcript:
+            logger.info("Generating meeting summary")
+            try:
+                summary_result = self.summarization_manager.generate_meeting_summary(
+                    full_transcript,
+                    self.current_meeting['participants']
+                )
+                logger.info("Summary generated successfully")
+            except Exception as e:
+                logger.error(f"Summarization failed: {e}", exc_info=True)
+                # Don't raise - summarization is optional
+
+        return self._complete_meeting(full_transcript, summary_result)
+
+    def stop_meeting_parallel(
+        self,
+        on_stage_complete: Optional[Callable[[str], None]] = None
+    ) -> dict[str, Any]:
+        """Stop the current meeting, running post-processing concurrently.
+
+        Behaves like stop_meeting(), but once the transcript is available
+        the independent summarization passes (summary, key points and
+        action items) run in a thread pool instead of one after another
+        when the engine is served out of process (Ollama). A model loaded
+        in-process runs the passes one at a time.
+
+        Args:
+            on_stage_complete: Optional callback invoked with the stage name
+                ('transcription', 'summary', 'key_points', 'action_items')
+                as each stage finishes successfully. Called from worker
+                threads.
+
+        Returns:
+            Same dictionary as stop_meeting()
+
+        Raises:
+            MeetingNotActiveError: If no meeting is currently active
+
+        Example:
+            >>> result = assistant.stop_meeting_parallel(
+            ...     on_stage_complete=lambda stage: print(f"{stage} done")
+            ... )
+        """
+        def notify(stage: str) -> None:
+            if on_stage_complete:
+                on_stage_complete(stage)
+
+        full_transcript = self._finish_recording()
+        notify('transcription')
+
+        summary_result = None
+        if config.processing.auto_summarize and full_transcript:
+            logger.info("Generating meeting summary (parallel)")
+            summary_result = self._generate_summary_parallel(
+                full_transcript,
+                self.current_meeting['participants'],
+                notify
+            )
+
+        return self._complete_meeting(full_transcript, summary_result)
+
+    def _finish_recording(self) -> str:
+        """Stop recording and produce the full transcript of the meeting.
+
+        Returns:
+            The full meeting transcript
+
+        Raises:
+            MeetingNotActiveError: If no meeting is currently active
+            TranscriptionError: If transcribing the recorded audio fails
+        """
         if not self.current_meeting:
             error_msg = "No meeting in progress"
             logger.error(error_msg)
@@ -347,20 +507,100 @@ class MeetingAssistant:
         logger.info(
             f"Transcript generated: {len(full_transcript)} characters"
         )
+        return full_transcript
 
-        # Generate summary if auto-summarize is enabled
-        summary_result = None
-        if config.processing.auto_summarize and full_transcript:
-            logger.info("Generating meeting summary")
+    def _generate_summary_parallel(
+        self,
+        transcript: str,
+        participants: list[str],
+        notify: Callable[[str], None]
+    ) -> dict[str, Any]:
+        """Run the summary, key point and action item passes.
+
+        The passes only run concurrently against an out-of-process engine
+        such as Ollama. Running them against one in-process model (Qwen)
+        would triple activation memory and oversubscribe torch threads on
+        SBCs without any throughput gain, so they run one at a time there.
+
+        Args:
+            transcript: Meeting transcript text
+            participants: Participant names
+            notify: Callback invoked with each stage name as it finishes
+                successfully
+
+        Returns:
+            Summary dictionary in the same shape as
+            SummarizationManager.generate_meeting_summary()
+        """
+        manager = self.summarization_manager
+        stages = {
+            'summary': manager.summarize,
+            'key_points': manager.extract_key_points,
+            'action_items': manager.extract_action_items,
+        }
+
+        concurrent = getattr(manager.current_engine, 'runs_out_of_process', False)
+
+        def on_done(future, stage: str) -> None:
+            # Failed stages are reported through the result's 'error'
+            if future.exception() is None:
+                notify(stage)
+
+        with ThreadPoolExecutor(max_workers=len(stages) if concurrent else 1) as executor:
+            futures = {}
+            for stage, func in stages.items():
+                future = executor.submit(func, transcript)
+                future.add_done_callback(lambda f, stage=stage: on_done(f, stage))
+                futures[stage] = future
+
+        summary_result = {
+            'summary': '',
+            'key_points': [],
+            'action_items': [],
+            'participants': participants,
+            'engine': manager.current_engine_name or 'None',
+            'success': True
+        }
+        errors = []
+        for stage, future in futures.items():
             try:
-                summary_result = self.summarization_manager.generate_meeting_summary(
-                    full_transcript,
-                    self.current_meeting['participants']
-                )
-                logger.info("Summary generated successfully")
+                value = future.result()
             except Exception as e:
-                logger.error(f"Summarization failed: {e}", exc_info=True)
-                # Don't raise - summarization is optional
+                logger.error(f"Summarization stage '{stage}' failed: {e}")
+                errors.append(f"{stage}: {e}")
+                continue
+            if stage == 'summary':
+                summary_result['summary'] = value.get('summary', '')
+            else:
+                summary_result[stage] = value
+
+        if errors:
+            summary_result['success'] = False
+            summary_result['error'] = "; ".join(errors)
+        else:
+            logger.info("Summary generated successfully")
+
+        return summary_result
+
+    def _complete_meeting(
+        self,
+        full_transcript: str,
+        summary_result: Optional[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Save the finished meeting and clear the active meeting state.
+
+        Args:
+            full_transcript: Full meeting transcript
+            summary_result: Optional summary data to store with the meeting
+
+        Returns:
+            Result dictionary as documented in stop_meeting()
+
+        Raises:
+            MeetingSaveError: If the meeting data cannot be saved
+        """
+        meeting_id = self.current_meeting['id']
+        audio_file = self.current_meeting['audio_file']
 
         # Save meeting data
         try:
@@ -459,6 +699,172 @@ class MeetingAssistant:
                 'success': False
             }
 
+    def transcribe_audio_file_chunked(
+        self,
+        audio_file: str,
+        workers: int = 4,
+        chunk_sec: int = 180,
+        on_chunk_complete: Optional[Callable[[int, int], None]] = None
+    ) -> dict[str, Any]:
+        """Transcribe a long WAV file by splitting it across a worker pool.
+
+        The file is cut into fixed-length chunks which are transcribed
+        concurrently and reassembled in input order. Files shorter than
+        one chunk, or that are not WAV, fall back to transcribe_audio_file().
+
+        Only engines that shell out per call (whisper.cpp) transcribe
+        chunks concurrently. In-process engines share a single model that
+        is not thread-safe (e.g. openai-whisper's kv-cache hooks), so their
+        chunks are transcribed one at a time.
+
+        Args:
+            audio_file: Path to the audio file to transcribe
+            workers: Number of chunks transcribed concurrently
+            chunk_sec: Chunk length in seconds
+            on_chunk_complete: Optional callback invoked with
+                (completed_chunks, total_chunks) from worker threads
+
+        Returns:
+            Dictionary in the same shape as transcribe_audio_file(), with
+            segment timestamps offset to the position in the full file. If
+            chunks failed, 'success' is False, 'failed_chunks' lists their
+            indices and 'error' describes the failures; the text of the
+            other chunks is still returned.
+
+        Example:
+            >>> result = assistant.transcribe_audio_file_chunked(
+            ...     '/path/to/long_meeting.wav', workers=4
+            ... )
+            >>> print(result['text'])
+        """
+        try:
+            with wave.open(audio_file, 'rb') as wf:
+                params = wf.getparams()
+                frames_per_chunk = params.framerate * chunk_sec
+                total_chunks = -(-params.nframes // frames_per_chunk)
+        except (wave.Error, EOFError) as e:
+            logger.debug(f"Not chunking {audio_file}: {e}")
+            total_chunks = 1
+
+        if total_chunks <= 1 or workers <= 1:
+            return self.transcribe_audio_file(audio_file)
+
+        logger.info(
+            f"Transcribing audio file in {total_chunks} chunks "
+            f"of {chunk_sec}s with {workers} workers: {audio_file}"
+        )
+
+        engine = self.stt_manager.current_engine
+        engine_lock = (
+            None if getattr(engine, 'runs_out_of_process', False)
+            else threading.Lock()
+        )
+        if engine_lock:
+            logger.debug(
+                "In-process STT engine: transcribing chunks one at a time"
+            )
+
+        completed = 0
+        completed_lock = threading.Lock()
+
+        def transcribe_chunk(chunk_path: str) -> dict[str, Any]:
+            nonlocal completed
+            # STTManager.transcribe() raises rather than returning an error
+            # dict; keep the failure local to this chunk so it is merged
+            # through failed_chunks instead of discarding the other chunks
+            try:
+                if engine_lock:
+                    with engine_lock:
+                        result = self.stt_manager.transcribe(chunk_path)
+                else:
+                    result = self.stt_manager.transcribe(chunk_path)
+            except Exception as e:
+                logger.error(f"Chunk transcription error ({chunk_path}): {e}")
+                result = {'text': '', 'success': False, 'error': str(e)}
+            with completed_lock:
+                completed += 1
+                done = completed
+            if on_chunk_complete:
+                on_chunk_complete(done, total_chunks)
+            return result
+
+        try:
+            with tempfile.TemporaryDirectory(prefix="chunks_") as tmp_dir, \
+                    ThreadPoolExecutor(max_workers=workers) as executor, \
+                    wave.open(audio_file, 'rb') as wf:
+                futures = []
+                for index in range(total_chunks):
+                    chunk_path = str(Path(tmp_dir) / f"chunk_{index:05d}.wav")
+                    with wave.open(chunk_path, 'wb') as out:
+                        out.setparams(params)
+                        out.writeframes(wf.readframes(frames_per_chunk))
+                    futures.append(executor.submit(transcribe_chunk, chunk_path))
+
+                results = [future.result() for future in futures]
+
+        except Exception as e:
+            logger.error(f"Chunked transcription error: {e}", exc_info=True)
+            return {
+                'text': '',
+                'error': str(e),
+                'success': False
+            }
+
+        failed_chunks = [
+            index for index, result in enumerate(results)
+            if result.get('error') or result.get('success') is False
+        ]
+
+        segments = []
+        for index, result in enumerate(results):
+            if index in failed_chunks:
+                continue
+            offset = index * chunk_sec
+            for segment in result.get('segments', []):
+                segments.append({
+                    **segment,
+                    'start': segment['start'] + offset,
+                    'end': segment['end'] + offset
+                })
+
+        # Engine and language come from the first chunk that succeeded
+        first = next(
+            (r for i, r in enumerate(results) if i not in failed_chunks),
+            results[0]
+        )
+        confidences = [r['confidence'] for r in results if 'confidence' in r]
+        merged = {
+            'text': " ".join(
+                r.get('text', '').strip() for r in results if r.get('text')
+            ),
+            'segments': segments,
+            'engine': first.get('engine'),
+            'chunks': total_chunks
+        }
+        if confidences:
+            merged['confidence'] = sum(confidences) / len(confidences)
+        if 'language' in first:
+            merged['language'] = first['language']
+
+        if failed_chunks:
+            errors = "; ".join(
+                f"chunk {index}: {results[index].get('error', 'unknown error')}"
+                for index in failed_chunks
+            )
+            logger.error(
+                f"{len(failed_chunks)}/{total_chunks} chunks failed: {errors}"
+            )
+            merged['success'] = False
+            merged['failed_chunks'] = failed_chunks
+            merged['error'] = (
+                f"{len(failed_chunks)} of {total_chunks} chunks failed: {errors}"
+            )
+
+        logger.info(
+            f"Chunked transcription completed: {len(merged['text'])} characters"
+        )
+        return merged
+
     def summarize_text(self, text: str) -> dict[str, Any]:
         """Summarize provided text.
 
@@ -490,6 +896,99 @@ class MeetingAssistant:
                 'success': False
             }
 
+    def summarize_text_stream(
+        self,
+        chunks: Iterable[str],
+        section_chars: int = 16000
+    ) -> dict[str, Any]:
+        """Summarize text delivered as an iterable of chunks.
+
+        Chunks are gathered into sections of about ``section_chars``
+        characters. Text that fits in a single section is summarized exactly
+        like summarize_text(). Longer text is summarized section by section,
+        then the section summaries are summarized again (summary of
+        summaries), so only one section is held in memory at a time.
+
+        Args:
+            chunks: Iterable of text chunks, e.g. from reading a file
+            section_chars: Approximate characters per summarization pass
+
+        Returns:
+            Dictionary in the same shape as summarize_text(), plus
+            ``sections`` with the number of sections summarized
+
+        Example:
+            >>> with open('transcript.txt', encoding='utf-8') as f:
+            ...     result = assistant.summarize_text_stream(iter(f))
+            >>> print(result['summary'])
+        """
+        def sections() -> Iterable[str]:
+            buffer: list[str] = []
+            size = 0
+            for chunk in chunks:
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= section_chars:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+            if buffer:
+                yield "".join(buffer)
+
+        partial_summaries: list[str] = []
+        key_points: list[str] = []
+        action_items: list[str] = []
+
+        try:
+            section_iter = iter(sections())
+            first = next(section_iter, "")
+            second = next(section_iter, None)
+            if second is None:
+                return self.summarize_text(first)
+
+            logger.info(
+                f"Summarizing long text in sections of {section_chars} characters"
+            )
+
+            for index, section in enumerate(
+                (first, second, *section_iter), start=1
+            ):
+                logger.debug(f"Summarizing section {index}: {len(section)} characters")
+                result = self.summarization_manager.generate_meeting_summary(section)
+                if not result.get('success', True):
+                    raise SummarizationError(
+                        result.get('error', 'Section summarization failed'),
+                        details={'section': index}
+                    )
+                partial_summaries.append(result.get('summary', ''))
+                key_points.extend(
+                    p for p in result.get('key_points', []) if p not in key_points
+                )
+                action_items.extend(
+                    a for a in result.get('action_items', []) if a not in action_items
+                )
+
+            overview = self.summarization_manager.summarize(
+                "\n\n".join(partial_summaries)
+            )
+            logger.info(
+                f"Summarization completed successfully ({index} sections)"
+            )
+            return {
+                'summary': overview.get('summary', ''),
+                'key_points': key_points,
+                'action_items': action_items,
+                'engine': overview.get('engine'),
+                'sections': index,
+                'success': True
+            }
+        except Exception as e:
+            logger.error(f"Summarization error: {e}", exc_info=True)
+            return {
+                'summary': '',
+                'error': str(e),
+                'success': False
+            }
+
     def _process_audio_chunk(self, audio_chunk) -> None:
         """Process real-time audio chunk for streaming transcription.
 
@@ -523,6 +1022,9 @@ class MeetingAssistant:
 
                 logger.debug(f"Transcribed chunk: {partial_text[:50]}...")
 
+                for listener in list(self._transcript_listeners):
+                    listener(partial_text)
+
         except Exception as e:
             logger.error(f"Error processing audio chunk: {e}", exc_info=True)
 
@@ -590,8 +1092,10 @@ class MeetingAssistant:
         logger.info("Cleaning up Meeting Assistant resources")
 
         try:
-            self.stt_manager.cleanup()
-            self.summarization_manager.cleanup()
+            if self._stt_manager is not None:
+                self._stt_manager.cleanup()
+            if self._summarization_manager is not None:
+                self._summarization_manager.cleanup()
             self.audio_recorder.cleanup()
             logger.info("Cleanup completed successfully")
         except Exception as e:
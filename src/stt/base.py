@@ -5,6 +5,10 @@ import numpy as np
 class STTEngine(ABC):
     """Base class for Speech-to-Text engines"""
 
+    # Whether each transcribe() call runs in a separate process, so calls
+    # from several threads cannot interfere with each other
+    runs_out_of_process = False
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.is_initialized = False
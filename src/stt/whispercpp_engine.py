@@ -22,6 +22,9 @@ logger = logging.getLogger(__name__)
 class WhisperCppEngine(STTEngine):
     """Whisper.cpp STT Engine (no PyTorch needed)"""
 
+    # Every transcription is a separate whisper.cpp process
+    runs_out_of_process = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.model_size = config.get('model_size', 'base')
@@ -4,6 +4,10 @@ from typing import Dict, Any, List, Optional
 class SummarizationEngine(ABC):
     """Base class for summarization engines"""
 
+    # Whether requests are served by a separate process (e.g. the Ollama
+    # server) rather than a model loaded into this one
+    runs_out_of_process = False
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.is_initialized = False
@@ -8,6 +8,9 @@ from src.summarization.base import SummarizationEngine
 class OllamaEngine(SummarizationEngine):
     """Ollama local summarization engine"""
 
+    # Requests go to the Ollama server over HTTP
+    runs_out_of_process = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.base_url = config.get('base_url', 'http://localhost:11434')
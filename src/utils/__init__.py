@@ -1,4 +1,5 @@
 """Utility modules for Meeting Assistant."""
 from .logger import get_logger, setup_logging
+from .events import JSONLEventEmitter
 
-__all__ = ['get_logger', 'setup_logging']
+__all__ = ['get_logger', 'setup_logging', 'JSONLEventEmitter']
@@ -0,0 +1,82 @@
+"""
+JSON-lines Event Output for Meeting Assistant.
+
+This module provides a small emitter that appends progress events as one
+JSON object per line, so external tools can follow long-running operations
+without parsing terminal output.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, TextIO, Union
+
+
+class JSONLEventEmitter:
+    """Append progress events to a JSON-lines file.
+
+    Each event is written as a single line such as
+    ``{"ts": 1700000000.0, "event": "chunk_completed", "completed": 3}``
+    and flushed immediately so readers can tail the file. Emitting is
+    thread-safe, as events may come from worker threads.
+
+    An emitter created without a path is disabled and ignores all events,
+    so callers can emit unconditionally.
+
+    Attributes:
+        path: Path of the events file, or None if disabled
+
+    Example:
+        >>> emitter = JSONLEventEmitter('events.jsonl')
+        >>> emitter.emit('transcription_started', file='meeting.wav')
+        >>> emitter.close()
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Initialize the emitter.
+
+        Args:
+            path: File to append events to. None disables the emitter.
+        """
+        self.path = Path(path) if path else None
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether events are being written."""
+        return self.path is not None
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Write one event line.
+
+        Args:
+            event: Event name
+            **fields: Additional JSON-serializable event data
+        """
+        if self.path is None:
+            return
+
+        record = {'ts': time.time(), 'event': event, **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the events file if it was opened."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'JSONLEventEmitter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()